@@ -0,0 +1,129 @@
+"""
+TLV editing helpers shared by the KLV field-stripping examples.
+
+These work directly on raw UAS Datalink LS packet values (the bytes after the
+16-byte key and BER length), so packets never go through klvdata.
+"""
+
+import io
+from typing import AbstractSet, List, Set, Tuple
+
+from vidmeta.video_builder import calculate_klv_checksum
+
+# Checksum tag, always recalculated
+CHECKSUM_TAG = 1
+
+
+def tlv_boundaries(packet: bytes) -> List[Tuple[int, int, int]]:
+    """
+    Locate the TLV records in a KLV packet value.
+
+    Args:
+        packet: Raw KLV packet value bytes
+
+    Returns:
+        List of (tag, start, end) triples where packet[start:end] is the whole
+        record (tag, BER length and value bytes)
+    """
+    boundaries = []
+    append = boundaries.append
+    offset = 0
+    packet_len = len(packet)
+    from_bytes = int.from_bytes
+
+    while offset < packet_len:
+        start = offset
+        tag = packet[offset]
+        length_byte = packet[offset + 1]
+        offset += 2
+
+        if length_byte & 0x80:
+            # Long form
+            num_length_bytes = length_byte & 0x7F
+            length = from_bytes(packet[offset : offset + num_length_bytes], "big")
+            offset += num_length_bytes
+        else:
+            # Short form
+            length = length_byte
+
+        offset += length
+        append((tag, start, offset))
+
+    return boundaries
+
+
+def ends_with_valid_checksum(
+    packet: bytes, boundaries: List[Tuple[int, int, int]]
+) -> bool:
+    """
+    Check whether a packet already ends in the checksum record a rebuild would write.
+
+    Args:
+        packet: Raw KLV packet value bytes
+        boundaries: TLV records of packet as returned by tlv_boundaries
+
+    Returns:
+        True if the only checksum record is a short-form 2-byte value at the very
+        end of the packet and it matches the running sum 16 of the bytes before it
+    """
+    if not boundaries:
+        return False
+    tag, start, end = boundaries[-1]
+    if tag != CHECKSUM_TAG or end != len(packet) or packet[start + 1] != 2:
+        return False
+    if any(t == CHECKSUM_TAG for t, _, _ in boundaries[:-1]):
+        return False
+    expected = calculate_klv_checksum(memoryview(packet)[: start + 2])
+    return int.from_bytes(packet[start + 2 : end], "big") == expected
+
+
+def strip_and_collect(
+    packet: bytes,
+    removed_tags: AbstractSet[int],
+    invalidated_tags: AbstractSet[int] = frozenset(),
+) -> Tuple[Set[int], bytes]:
+    """
+    Remove and invalidate tags in a KLV packet, reporting which tags it had.
+
+    Args:
+        packet: Raw KLV packet value bytes
+        removed_tags: Tags dropped from the packet entirely
+        invalidated_tags: Tags rewritten with a 0-byte length, which parsers
+            that expect a fixed-size value (KWIVER) reject as unparseable
+
+    Returns:
+        Tuple of (tags_present, modified_packet) where tags_present holds every
+        tag number found in the original packet
+    """
+    boundaries = tlv_boundaries(packet)
+    tags_present = {tag for tag, _, _ in boundaries}
+
+    # A packet with none of the edited tags and an intact trailing checksum
+    # would be rebuilt byte for byte, so hand it back untouched
+    if (
+        removed_tags.isdisjoint(tags_present)
+        and invalidated_tags.isdisjoint(tags_present)
+        and ends_with_valid_checksum(packet, boundaries)
+    ):
+        return tags_present, bytes(packet)
+
+    # Copy every kept record verbatim (original length encoding included) into
+    # one buffer, skipping removed tags and the checksum (we'll recalculate)
+    src = memoryview(packet)
+    buf = io.BytesIO()
+    write = buf.write
+
+    for tag, start, end in boundaries:
+        if tag == CHECKSUM_TAG or tag in removed_tags:
+            continue
+        if tag in invalidated_tags:
+            write(bytes((tag, 0)))  # Length is 0 bytes - invalid, will fail to parse
+        else:
+            write(src[start:end])
+
+    # Per MISB ST 0601.19 section 6.2.2, the running sum 16 covers the
+    # checksum tag+length bytes too
+    write(b"\x01\x02")  # Checksum tag, checksum length
+    packet_data = buf.getvalue()
+    checksum = calculate_klv_checksum(packet_data)
+    return tags_present, packet_data + checksum.to_bytes(2, byteorder="big")
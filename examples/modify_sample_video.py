@@ -6,6 +6,8 @@ This example shows how to take an existing video with KLV metadata
 and create a modified version with changed metadata values.
 """
 
+import shutil
+import urllib.error
 import urllib.request
 from pathlib import Path
 
@@ -32,7 +34,7 @@ def download_sample_video():
     print(f"   Destination: {video_file}")
 
     try:
-        urllib.request.urlretrieve(download_url, video_file)
+        _download_resumable(download_url, video_file)
         file_size_mb = video_file.stat().st_size / (1024 * 1024)
         print(f"✓ Downloaded successfully ({file_size_mb:.1f} MB)")
         return str(video_file)
@@ -43,6 +45,40 @@ def download_sample_video():
         raise
 
 
+def _download_resumable(url: str, destination: Path, chunk_size: int = 1 << 20):
+    """
+    Stream a download to disk in large chunks, resuming a previous partial file.
+
+    Data is written to ``<destination>.part`` and renamed into place once the
+    transfer completes, so an interrupted run never leaves a truncated video
+    behind. If a partial file exists, a Range request continues from its end;
+    servers that ignore the range (HTTP 200) restart the download from scratch.
+    """
+    partial = destination.with_name(destination.name + ".part")
+    resume_from = partial.stat().st_size if partial.exists() else 0
+
+    request = urllib.request.Request(url)
+    if resume_from:
+        request.add_header("Range", f"bytes={resume_from}-")
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:  # 416: partial file already holds the whole body
+            raise
+        partial.replace(destination)
+        return
+
+    with response:
+        mode = "ab" if resume_from and response.status == 206 else "wb"
+        if resume_from and mode == "ab":
+            print(f"   Resuming from {resume_from / (1024 * 1024):.1f} MB")
+        with open(partial, mode) as f:
+            shutil.copyfileobj(response, f, chunk_size)
+
+    partial.replace(destination)
+
+
 def main():
     print("=" * 60)
     print("Modify Sample Video Example")
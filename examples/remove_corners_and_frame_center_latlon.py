@@ -17,20 +17,20 @@ from metadata (not added at all).
 import tempfile
 from pathlib import Path
 
-import cv2
-from klvdata import misb0601
-
-from vidmeta.video_builder import (
-    VideoFrameGenerator,
-    build_klv_video,
-    calculate_klv_checksum,
-)
+from klv_tlv import strip_and_collect
+from vidmeta.video_builder import build_klv_video
 from vidmeta.video_modifier import (
+    StreamingFrameGenerator,
     extract_klv_stream_ffmpeg,
-    extract_video_frames,
-    parse_klv_file,
+    read_klv_packets,
+    stream_video,
 )
 
+# Tags to remove - only corner points (tags 26-33)
+_CORNER_TAGS = frozenset(range(26, 34))
+# Tags to replace with invalid bytes - frame center lat/lon
+_FRAME_CENTER_LATLON_TAGS = frozenset((23, 24))
+
 
 def remove_fields_from_packet(packet: bytes) -> bytes:
     """
@@ -49,68 +49,7 @@ def remove_fields_from_packet(packet: bytes) -> bytes:
     Returns:
         Modified packet with corner points removed and frame center lat/lon invalid
     """
-    # Tags to remove - only corner points
-    tags_to_remove = set(range(26, 34))  # Corner points (tags 26-33)
-    # Tags to replace with invalid bytes
-    tags_to_invalidate = {23, 24}  # Frame center lat/lon
-
-    # Rebuild packet without specified tags
-    packet_data = bytearray()
-    offset = 0
-
-    while offset < len(packet):
-        # Read tag
-        tag = packet[offset]
-        offset += 1
-
-        # Read length (BER encoded)
-        length_byte = packet[offset]
-        offset += 1
-
-        if length_byte & 0x80:
-            # Long form
-            num_length_bytes = length_byte & 0x7F
-            length = int.from_bytes(packet[offset : offset + num_length_bytes], "big")
-            offset += num_length_bytes
-        else:
-            # Short form
-            length = length_byte
-
-        # Read value
-        value = packet[offset : offset + length]
-        offset += length
-
-        # Skip tags in removal list and checksum (we'll recalculate)
-        if tag in tags_to_remove or tag == 1:  # 1 is checksum
-            continue
-
-        # For tags we want to invalidate, write with 0-byte length
-        # KWIVER expects 4 bytes for lat/lon (klv_sflint_format)
-        # Writing 0 bytes causes parse failure -> klv_blob -> invalid -> not added to metadata
-        if tag in tags_to_invalidate:
-            packet_data.append(tag)
-            packet_data.append(0)  # Length is 0 bytes - invalid, will fail to parse
-        else:
-            # Keep original tag/length/value
-            packet_data.append(tag)
-            if length < 128:
-                packet_data.append(length)
-            else:
-                length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
-                packet_data.append(0x80 | len(length_bytes))
-                packet_data.extend(length_bytes)
-            packet_data.extend(value)
-
-    # Add checksum (running sum 16)
-    # Per MISB ST 0601.19 section 6.2.2: checksum includes tag+length bytes
-    packet_data.append(1)  # Checksum tag
-    packet_data.append(2)  # Checksum length
-
-    # Calculate checksum over all data including checksum tag+length
-    checksum = calculate_klv_checksum(bytes(packet_data))
-    packet_data.extend(checksum.to_bytes(2, byteorder="big"))
-
-    return bytes(packet_data)
+    return strip_and_collect(packet, _CORNER_TAGS, _FRAME_CENTER_LATLON_TAGS)[1]
 
 
 def main():
@@ -130,77 +69,59 @@ def main():
         temp_klv = Path(temp_dir) / "extracted.klv"
         extract_klv_stream_ffmpeg(input_video, str(temp_klv))
 
-        # Parse KLV metadata
-        print("Parsing KLV metadata...")
-        original_metadata = parse_klv_file(str(temp_klv))
-
-    # Extract video frames first to know how many we have
-    print("Extracting video frames...")
-    frames = extract_video_frames(input_video)
-    num_video_frames = len(frames)
-
-    # Process each frame's metadata
+        # Split the stream into per-frame packets; only the raw bytes are
+        # edited, so nothing needs parsing
+        print("Reading KLV packets...")
+        original_packets = read_klv_packets(str(temp_klv))
+
+    # Open the video to know how many frames we have; frames are decoded
+    # lazily while the output is written. The count is the container's
+    # estimate: if the video decodes fewer frames, the frame generator raises,
+    # and if it decodes more, the check after the build below fails.
+    print("Opening video frames...")
+    frames, video_properties = stream_video(input_video)
+    num_video_frames = video_properties["num_frames"]
+
+    # Edit each frame's raw packet, noting which of the edited fields it had.
+    # The same TLV scan serves both, so klvdata never parses the packet.
     print("Removing corner points and setting frame center lat/lon to invalid...")
     modified_metadata = []
     frames_with_corners = 0
     frames_with_frame_center_latlon = 0
-    corner_tags = set(range(26, 34))  # Tags 26-33
-    frame_center_latlon_tags = {23, 24}  # Tags 23-24 (will be set to 999.0, not removed)
+
+    get_original = original_packets.get
+    append_metadata = modified_metadata.append
 
     for frame_num in range(num_video_frames):
-        if frame_num in original_metadata:
-            # parse_klv_file returns (metadata_dict, raw_packet, unknown_tags)
-            metadata_dict, raw_packet, unknown_tags = original_metadata[frame_num]
-
-            # Check if this frame has corner points or frame center lat/lon
-            uas_set = misb0601.UASLocalMetadataSet(raw_packet)
-            metadata_tags = uas_set.MetadataList()
-            has_corners = any(tag in corner_tags for tag in metadata_tags.keys())
-            has_frame_center_latlon = any(
-                tag in frame_center_latlon_tags for tag in metadata_tags.keys()
+        raw_packet = get_original(frame_num)
+        if raw_packet is not None:
+            # KWIVER expects 4 bytes for lat/lon (klv_sflint_format). Writing 0
+            # bytes causes parse failure -> klv_blob -> invalid -> not added
+            # to metadata
+            tags_present, modified_packet = strip_and_collect(
+                raw_packet, _CORNER_TAGS, _FRAME_CENTER_LATLON_TAGS
             )
-
-            if has_corners:
+            if not _CORNER_TAGS.isdisjoint(tags_present):
                 frames_with_corners += 1
-            if has_frame_center_latlon:
+            if not _FRAME_CENTER_LATLON_TAGS.isdisjoint(tags_present):
                 frames_with_frame_center_latlon += 1
-
-            # Remove specified fields from raw packet
-            modified_packet = remove_fields_from_packet(raw_packet)
-
-            # Build new metadata dict
-            metadata = metadata_dict.copy()
-
-            # Use the modified raw packet which has invalid bytes for frame center lat/lon
-            metadata["_raw_klv_packet"] = modified_packet
-
-            if unknown_tags:
-                metadata["_unknown_klv_tags"] = unknown_tags
-            modified_metadata.append(metadata)
+            # Use the modified raw packet which has invalid bytes for frame
+            # center lat/lon. create_packet_from_dict passes it through as-is
+            # and ignores every other key
+            append_metadata({"_raw_klv_packet": modified_packet})
         else:
             # No metadata for this frame
-            modified_metadata.append({})
+            append_metadata({})
 
-    # Get video properties
-    cap = cv2.VideoCapture(input_video)
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cap.release()
+    # Video properties were read from the same capture that decodes the frames
+    fps = video_properties["fps"]
+    width = video_properties["width"]
+    height = video_properties["height"]
 
     print(f"\nGenerating output video: {width}x{height} @ {fps} fps")
 
     # Create frame generator
-    class PreExtractedFrameGenerator(VideoFrameGenerator):
-        def __init__(self, frames_list):
-            self.frames_list = frames_list
-            self.width = frames_list[0].shape[1] if frames_list else 0
-            self.height = frames_list[0].shape[0] if frames_list else 0
-
-        def generate_frame(self, frame_num, _total_frames, _custom_text=None):
-            return self.frames_list[frame_num]
-
-    frame_gen = PreExtractedFrameGenerator(frames)
+    frame_gen = StreamingFrameGenerator(frames)
 
     # Build video
     result = build_klv_video(
@@ -213,13 +134,22 @@ def main():
         frame_generator=frame_gen,
     )
 
+    # Frames left over mean the estimate was short and the output is missing
+    # the end of the video
+    if next(frames, None) is not None:
+        frames.close()
+        raise RuntimeError(
+            f"Video has more than the {num_video_frames} frames its container "
+            "reports; the output is truncated"
+        )
+
     print()
     print("=" * 60)
     print("Complete!")
     print("=" * 60)
     print(f"\nGenerated: {result['video_path']}")
     print(f"Total frames: {result['num_frames']}")
-    print(f"Metadata frames: {len(original_metadata)}")
+    print(f"Metadata frames: {len(original_packets)}")
     print(f"Frames with corner points: {frames_with_corners}")
     print(f"Frames with frame center lat/lon: {frames_with_frame_center_latlon}")
     print(f"KLV bytes: {result['total_klv_bytes']}")
@@ -0,0 +1,35 @@
+"""Test the generate-klv-video command line."""
+
+from pathlib import Path
+
+from vidmeta import cli, video_builder
+
+
+def test_all_with_output_names_one_file_per_scenario(monkeypatch, tmp_path):
+    """Test that --all -o suffixes the output file name with each scenario name."""
+    output_paths = []
+
+    def fake_build_klv_video(output_path, metadata_per_frame, **kwargs):
+        output_paths.append(output_path)
+        return {
+            "success": True,
+            "video_path": output_path,
+            "klv_path": output_path + ".klv",
+            "num_frames": len(metadata_per_frame),
+            "total_klv_bytes": 0,
+            "avg_packet_size": 0.0,
+        }
+
+    monkeypatch.setattr(video_builder, "build_klv_video", fake_build_klv_video)
+
+    result = cli.main(["--all", "-o", str(tmp_path / "out.ts")])
+
+    assert result == 0
+    assert [Path(path).parent for path in output_paths] == [tmp_path] * 5
+    assert [Path(path).name for path in output_paths] == [
+        "out_sample_video.ts",
+        "out_stationary.ts",
+        "out_moving.ts",
+        "out_high_altitude.ts",
+        "out_minimal.ts",
+    ]
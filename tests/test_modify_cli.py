@@ -0,0 +1,141 @@
+"""Test the modify-klv-video command line parsing."""
+
+import json
+import sys
+
+import pytest
+
+from vidmeta import modify_cli, video_modifier
+from vidmeta.video_builder import KLVMetadataGenerator
+
+
+@pytest.fixture
+def modify_calls(monkeypatch):
+    """Record modify_video_metadata calls instead of processing a video."""
+    calls = []
+
+    def fake_modify_video_metadata(**kwargs):
+        calls.append(kwargs)
+        return {
+            "video_path": kwargs["output_video_path"],
+            "klv_path": "out.klv",
+            "num_frames": 1,
+        }
+
+    monkeypatch.setattr(
+        video_modifier, "modify_video_metadata", fake_modify_video_metadata
+    )
+    return calls
+
+
+def test_set_converts_values_to_field_types(modify_calls):
+    """Test that --set values take the int, float or str type of their field."""
+    result = modify_cli.main(
+        [
+            "in.ts",
+            "-o",
+            "out.ts",
+            "--frame",
+            "3",
+            "--set",
+            "version=19",
+            "altitude=2000",
+            "mission_id=007",
+            "sensor_name=EO=1",
+        ]
+    )
+
+    assert result == 0
+    fields = modify_calls[0]["metadata_overrides"][3]
+    assert fields == {
+        "version": 19,
+        "altitude": 2000.0,
+        "mission_id": "007",
+        "sensor_name": "EO=1",
+    }
+    assert type(fields["version"]) is int
+    assert type(fields["altitude"]) is float
+
+
+@pytest.mark.parametrize("value, expected", [("1.0", 1), ("2", 2), ("1.5", 1.5)])
+def test_set_int_field_accepts_decimal_spelling(modify_calls, value, expected):
+    """Test that int fields accept decimal spellings and the value still encodes."""
+    result = modify_cli.main(
+        ["in.ts", "-o", "out.ts", "--frame", "0", "--set", f"version={value}"]
+    )
+
+    assert result == 0
+    version = modify_calls[0]["metadata_overrides"][0]["version"]
+    assert version == expected and type(version) is type(expected)
+    # Must encode without the TypeError a "1.0" string used to cause
+    KLVMetadataGenerator().create_packet_from_dict({"version": version})
+
+
+def test_decoder_options_reach_modify_video_metadata(modify_calls):
+    """Test that --decoder and --hwaccel are passed through, defaulting to OpenCV."""
+    base = ["in.ts", "-o", "out.ts", "--frame", "0", "--set", "latitude=1"]
+
+    default_result = modify_cli.main(base)
+    pyav_result = modify_cli.main(
+        base + ["--re-encode", "--decoder", "pyav", "--hwaccel", "cuda"]
+    )
+
+    assert default_result == pyav_result == 0
+    assert (modify_calls[0]["decoder"], modify_calls[0]["hwaccel"]) == ("opencv", None)
+    assert (modify_calls[1]["decoder"], modify_calls[1]["hwaccel"]) == ("pyav", "cuda")
+    assert modify_calls[1]["lossless"] is False
+
+
+@pytest.mark.parametrize("field_value", ["latitude", "=37.5", "1latitude=37.5"])
+def test_set_rejects_malformed_pairs(modify_calls, capsys, field_value):
+    """Test that a --set token not of the form field=value is an error."""
+    result = modify_cli.main(
+        ["in.ts", "-o", "out.ts", "--frame", "0", "--set", field_value]
+    )
+
+    assert result == 1
+    assert f"Invalid format '{field_value}'" in capsys.readouterr().out
+    assert modify_calls == []
+
+
+def test_set_rejects_unknown_field(modify_calls, capsys):
+    """Test that --set with a field the models don't declare is an error."""
+    result = modify_cli.main(
+        ["in.ts", "-o", "out.ts", "--frame", "0", "--set", "lattitude=37.5"]
+    )
+
+    out = capsys.readouterr().out
+    assert result == 1
+    assert "Error: Unknown metadata field 'lattitude'" in out
+    assert "Valid fields: " in out and "latitude" in out
+    assert modify_calls == []
+
+
+@pytest.mark.parametrize(
+    "blocked",
+    [(), ("msgspec",), ("msgspec", "orjson")],
+    ids=["default", "orjson", "json"],
+)
+def test_overrides_file_decoders(modify_calls, monkeypatch, tmp_path, blocked):
+    """Test that every overrides decoder fallback gives int frame keys."""
+    for name in blocked:
+        # A None entry makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, name, None)
+    modify_cli._get_overrides_decoder.cache_clear()
+    overrides = tmp_path / "overrides.json"
+    overrides.write_text(
+        json.dumps({"0": {"latitude": 37.5}, "12": {"sensor_name": "IR"}})
+    )
+
+    try:
+        result = modify_cli.main(
+            ["in.ts", "-o", "out.ts", "--overrides", str(overrides)]
+        )
+    finally:
+        modify_cli._get_overrides_decoder.cache_clear()
+
+    assert result == 0
+    assert modify_calls[0]["metadata_overrides"] == {
+        0: {"latitude": 37.5},
+        12: {"sensor_name": "IR"},
+    }
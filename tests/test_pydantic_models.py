@@ -10,9 +10,12 @@ from vidmeta.models import (
     ParsedKLVPacket,
 )
 from vidmeta.klv_converter import (
+    _extract_unknown_tags,
     flat_dict_to_pydantic,
+    parse_klv_packet_to_pydantic,
     pydantic_to_flat_dict,
 )
+from vidmeta.video_builder import KLVMetadataGenerator
 
 
 def test_platform_metadata_creation():
@@ -146,6 +149,40 @@ def test_round_trip_conversion():
     assert result["sensor_name"] == original["sensor_name"]
 
 
+def test_parsed_packet_unknown_tags_match_reparse():
+    """Test that unknown tags cached by the parser match a fresh extraction."""
+    packet = KLVMetadataGenerator().create_packet_from_dict(
+        {
+            "latitude": 37.7749,
+            "_unknown_klv_tags": {"64": bytes([100, 2, 0xAB, 0xCD])},
+        }
+    )
+    value = packet[17:]  # Strip 16-byte UAS LS key and 1-byte length
+
+    _, _, unknown_tags = pydantic_to_flat_dict(parse_klv_packet_to_pydantic(value))
+
+    assert unknown_tags == {"64": bytes([100, 2, 0xAB, 0xCD])}
+    assert unknown_tags == _extract_unknown_tags(value)
+
+
+def test_parsed_packet_equality_ignores_unknown_tag_cache():
+    """Test that a parsed packet equals one built from the same fields."""
+    packet = KLVMetadataGenerator().create_packet_from_dict(
+        {
+            "latitude": 37.7749,
+            "_unknown_klv_tags": {"64": bytes([100, 2, 0xAB, 0xCD])},
+        }
+    )
+    value = packet[17:]  # Strip 16-byte UAS LS key and 1-byte length
+
+    parsed = parse_klv_packet_to_pydantic(value)
+    rebuilt = ParsedKLVPacket(metadata=parsed.metadata, raw_packet=value)
+
+    assert parsed == rebuilt
+    assert parsed == parse_klv_packet_to_pydantic(value)
+    assert parsed != ParsedKLVPacket(metadata=parsed.metadata, raw_packet=b"")
+
+
 def test_empty_metadata():
     """Test creating empty metadata structures."""
     metadata = KLVMetadata()
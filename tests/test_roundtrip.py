@@ -1,8 +1,8 @@
 """Test round-trip metadata preservation and lossless video modification."""
 
 import hashlib
+import os
 import subprocess
-import tempfile
 import urllib.request
 from pathlib import Path
 
@@ -24,12 +24,45 @@ def sample_video():
         download_url = (
             "https://data.kitware.com/api/v1/file/604a5a532fa25629b931c673/download"
         )
-        urllib.request.urlretrieve(download_url, video_file)
+        # Download to a per-process name and rename into place, so parallel
+        # pytest-xdist workers never see (or clobber) a partial file
+        partial_file = video_file.with_name(f"{video_file.name}.{os.getpid()}.part")
+        urllib.request.urlretrieve(download_url, partial_file)
+        os.replace(partial_file, video_file)
 
     return str(video_file)
 
 
-def test_roundtrip_preserves_metadata(sample_video, tmp_path):
+@pytest.fixture(scope="module")
+def original_klv_metadata(sample_video, tmp_path_factory):
+    """Extract and parse the sample video's original KLV once for all tests."""
+    temp_klv = tmp_path_factory.mktemp("original_klv") / "original.klv"
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        sample_video,
+        "-map",
+        "0:d",
+        "-c",
+        "copy",
+        "-f",
+        "data",
+        str(temp_klv),
+    ]
+    subprocess.run(cmd, capture_output=True, check=True)
+
+    return parse_klv_file(str(temp_klv))
+
+
+def get_metadata(frame_entry):
+    """Return the metadata dict from a parse_klv_file entry."""
+    # parse_klv_file entries are always (metadata_dict, raw_packet, unknown_tags)
+    assert isinstance(frame_entry, tuple) and len(frame_entry) == 3
+    return frame_entry[0]
+
+
+def test_roundtrip_preserves_metadata(sample_video, original_klv_metadata, tmp_path):
     """Test that round-trip preserves all metadata correctly."""
     output_video = tmp_path / "roundtrip_test.ts"
 
@@ -45,24 +78,8 @@ def test_roundtrip_preserves_metadata(sample_video, tmp_path):
     assert Path(result["video_path"]).exists()
     assert Path(result["klv_path"]).exists()
 
-    # Extract original KLV for comparison
-    temp_klv = tempfile.mktemp(suffix=".klv")
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        sample_video,
-        "-map",
-        "0:d",
-        "-c",
-        "copy",
-        "-f",
-        "data",
-        temp_klv,
-    ]
-    subprocess.run(cmd, capture_output=True, check=True)
-
-    original_metadata = parse_klv_file(temp_klv)
+    # Original KLV for comparison, extracted independently of the modifier
+    original_metadata = original_klv_metadata
     roundtrip_metadata = parse_klv_file(result["klv_path"])
 
     # Check we have metadata
@@ -79,30 +96,9 @@ def test_roundtrip_preserves_metadata(sample_video, tmp_path):
         if frame_num >= len(roundtrip_metadata):
             continue
 
-        # Unpack tuples (metadata_dict, raw_packet, unknown_tags)
-        orig_tuple = original_metadata.get(frame_num, ({}, None, {}))
-        trip_tuple = roundtrip_metadata.get(frame_num, ({}, None, {}))
-
         # Extract just the metadata dicts
-        if isinstance(orig_tuple, tuple):
-            if len(orig_tuple) >= 3:
-                orig, _, _ = orig_tuple[0], orig_tuple[1], orig_tuple[2]
-            elif len(orig_tuple) == 2:
-                orig, _ = orig_tuple
-            else:
-                orig = orig_tuple[0]
-        else:
-            orig = orig_tuple
-
-        if isinstance(trip_tuple, tuple):
-            if len(trip_tuple) >= 3:
-                trip, _, _ = trip_tuple[0], trip_tuple[1], trip_tuple[2]
-            elif len(trip_tuple) == 2:
-                trip, _ = trip_tuple
-            else:
-                trip = trip_tuple[0]
-        else:
-            trip = trip_tuple
+        orig = get_metadata(original_metadata.get(frame_num, ({}, None, {})))
+        trip = get_metadata(roundtrip_metadata.get(frame_num, ({}, None, {})))
 
         # Check all keys are preserved
         assert orig.keys() == trip.keys(), f"Frame {frame_num}: key mismatch"
@@ -128,9 +124,6 @@ def test_roundtrip_preserves_metadata(sample_video, tmp_path):
                     f"Frame {frame_num}, {key}: {orig_val} != {trip_val}"
                 )
 
-    # Cleanup
-    Path(temp_klv).unlink()
-
 
 def test_roundtrip_frame_count_matches(sample_video, tmp_path):
     """Test that output has same number of frames as input."""
@@ -189,17 +182,7 @@ def test_modification_with_overrides(sample_video, tmp_path):
     output_metadata = parse_klv_file(result["klv_path"])
 
     # Check frame 0 has the new values
-    # Unpack tuple (metadata_dict, raw_packet, unknown_tags)
-    frame_0_tuple = output_metadata[0]
-    if isinstance(frame_0_tuple, tuple):
-        if len(frame_0_tuple) >= 3:
-            frame_0 = frame_0_tuple[0]
-        elif len(frame_0_tuple) == 2:
-            frame_0 = frame_0_tuple[0]
-        else:
-            frame_0 = frame_0_tuple[0]
-    else:
-        frame_0 = frame_0_tuple
+    frame_0 = get_metadata(output_metadata[0])
 
     assert abs(frame_0["latitude"] - 37.7749) < 0.01
     assert abs(frame_0["longitude"] - (-122.4194)) < 0.01
@@ -229,12 +212,6 @@ def test_multiple_frame_modifications(sample_video, tmp_path):
 
     output_metadata = parse_klv_file(result["klv_path"])
 
-    # Helper to unpack tuples (handles 2 or 3 element tuples)
-    def get_metadata(frame_tuple):
-        if isinstance(frame_tuple, tuple) and len(frame_tuple) > 0:
-            return frame_tuple[0]
-        return frame_tuple
-
     # Check each modified frame (allow 0.1 tolerance for KLV encoding precision)
     assert abs(get_metadata(output_metadata[0])["latitude"] - 40.0) < 0.1
     assert abs(get_metadata(output_metadata[5])["heading"] - 180.0) < 0.1
@@ -246,17 +223,42 @@ def test_multiple_frame_modifications(sample_video, tmp_path):
     assert "latitude" in get_metadata(output_metadata[10])  # Not modified
 
 
-def extract_frame_hashes(video_path: str, frame_indices: list) -> dict:
-    """Extract MD5 hashes of specific frames from a video."""
-    cap = cv2.VideoCapture(video_path)
-    hashes = {}
+def frame_hash(frame) -> str:
+    """Hash a decoded frame's pixels without copying them out of the array."""
+    return hashlib.blake2b(memoryview(frame).cast("B"), digest_size=16).hexdigest()
+
+
+def iter_sampled_frames(cap, frame_indices):
+    """
+    Decode a capture front to back, yielding (frame_idx, frame) for the
+    requested indices.
+
+    One sequential pass is much cheaper than seeking to each index, which
+    re-decodes from the previous keyframe on long-GOP streams. Frames that
+    aren't sampled are only grabbed, never converted to BGR.
+
+    Every sampled frame is retrieved into the same buffer, so each yielded
+    frame is only valid until the next one is requested.
+    """
+    wanted = set(frame_indices)
+    last = max(wanted, default=-1)
+    frame_idx = 0
+    frame = None
+    while frame_idx <= last and cap.grab():
+        if frame_idx in wanted:
+            ret, frame = cap.retrieve(frame)
+            if ret:
+                yield frame_idx, frame
+        frame_idx += 1
 
-    for frame_idx in frame_indices:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if ret:
-            hashes[frame_idx] = hashlib.md5(frame.tobytes()).hexdigest()
 
+def extract_frame_hashes(video_path: str, frame_indices: list) -> dict:
+    """Extract BLAKE2b hashes of specific frames from a video."""
+    cap = cv2.VideoCapture(video_path)
+    hashes = {
+        frame_idx: frame_hash(frame)
+        for frame_idx, frame in iter_sampled_frames(cap, frame_indices)
+    }
     cap.release()
     return hashes
 
@@ -338,11 +340,6 @@ def test_re_encode_mode_still_works(sample_video, tmp_path):
     # Verify metadata was modified
     output_metadata = parse_klv_file(result["klv_path"])
 
-    def get_metadata(frame_tuple):
-        if isinstance(frame_tuple, tuple) and len(frame_tuple) > 0:
-            return frame_tuple[0]
-        return frame_tuple
-
     assert abs(get_metadata(output_metadata[0])["latitude"] - 55.0) < 0.1
 
 
@@ -375,19 +372,16 @@ def test_lossless_preserves_all_frames(sample_video, tmp_path):
     frames_checked = 0
     frames_matched = 0
 
-    for frame_idx in range(0, min(original_frame_count, output_frame_count), 100):
-        cap_original.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        cap_output.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-
-        ret1, frame1 = cap_original.read()
-        ret2, frame2 = cap_output.read()
-
-        if ret1 and ret2:
-            frames_checked += 1
-            hash1 = hashlib.md5(frame1.tobytes()).hexdigest()
-            hash2 = hashlib.md5(frame2.tobytes()).hexdigest()
-            if hash1 == hash2:
-                frames_matched += 1
+    sampled = range(0, min(original_frame_count, output_frame_count), 100)
+    for (idx1, frame1), (idx2, frame2) in zip(
+        iter_sampled_frames(cap_original, sampled),
+        iter_sampled_frames(cap_output, sampled),
+    ):
+        frames_checked += 1
+        hash1 = frame_hash(frame1)
+        hash2 = frame_hash(frame2)
+        if idx1 == idx2 and hash1 == hash2:
+            frames_matched += 1
 
     cap_original.release()
     cap_output.release()
@@ -0,0 +1,218 @@
+"""Test KLV packet encoding and video building."""
+
+import io
+import subprocess
+
+import numpy as np
+import pytest
+from klvdata import misb0601
+from klvdata.elementparser import MappedElementParser, StringElementParser
+
+from vidmeta.video_builder import (
+    _ELEMENT_CLASSES,
+    _NUMPY_CHECKSUM_MIN_WORDS,
+    KLVMetadataGenerator,
+    VideoFrameGenerator,
+    _mapped_element_encoder,
+    _string_element_encoder,
+    build_klv_video,
+    calculate_klv_checksum,
+)
+
+_MAPPED_CLASSES = [
+    element_class
+    for _, element_class in _ELEMENT_CLASSES
+    if issubclass(element_class, MappedElementParser)
+] + [misb0601.UASLSVersionNumber]
+_STRING_CLASSES = [
+    element_class
+    for _, element_class in _ELEMENT_CLASSES
+    if issubclass(element_class, StringElementParser)
+]
+
+
+def _mapped_values(element_class):
+    """Values at and around the edges of an element's engineering range."""
+    src_min, src_max = element_class._range
+    return [
+        src_min,
+        src_max,
+        int(src_min),
+        int(src_max),
+        (src_min + src_max) / 2,
+        0,
+        0.0,
+        -1.5,
+        1e-9,
+        src_max * 0.999999,
+        src_min - 1,
+        src_max + 1,
+        float("nan"),
+        float("inf"),
+        float("-inf"),
+    ]
+
+
+def _encode_both(encoder, element_class, value):
+    """Encode value with both encoders, returning each result or exception type."""
+    results = []
+    for encode in (encoder, lambda v: bytes(element_class(v))):
+        try:
+            results.append(encode(value))
+        except Exception as e:
+            results.append(type(e))
+    return results
+
+
+@pytest.mark.parametrize("element_class", _MAPPED_CLASSES, ids=lambda c: c.__name__)
+def test_mapped_element_encoder_matches_klvdata(element_class):
+    """Test that mapped encoders give klvdata's bytes, or raise its exception."""
+    encode = _mapped_element_encoder(element_class)
+
+    for value in _mapped_values(element_class):
+        fast, reference = _encode_both(encode, element_class, value)
+        assert fast == reference, value
+
+
+@pytest.mark.parametrize("element_class", _STRING_CLASSES, ids=lambda c: c.__name__)
+def test_string_element_encoder_matches_klvdata(element_class):
+    """Test that string encoders give klvdata's bytes, including BER long form."""
+    encode = _string_element_encoder(element_class)
+
+    for value in ["", "MQ-9", "Ünïcødé ✈", "x" * 200, b"RAW"]:
+        fast, reference = _encode_both(encode, element_class, value)
+        assert fast == reference, value
+
+
+def _reference_checksum(data: bytes) -> int:
+    """Running sum 16 as a plain byte loop, as written in MISB ST 0601."""
+    total = 0
+    for i, byte in enumerate(data):
+        total += byte << (8 * ((i + 1) % 2))
+    return total & 0xFFFF
+
+
+@pytest.mark.parametrize(
+    "length",
+    [
+        0,
+        1,
+        2,
+        3,
+        101,
+        2 * _NUMPY_CHECKSUM_MIN_WORDS - 2,
+        2 * _NUMPY_CHECKSUM_MIN_WORDS - 1,
+        2 * _NUMPY_CHECKSUM_MIN_WORDS,
+        2 * _NUMPY_CHECKSUM_MIN_WORDS + 1,
+        4097,
+    ],
+)
+def test_calculate_klv_checksum_matches_byte_loop(length):
+    """Test the struct and NumPy checksum paths against a byte-by-byte sum."""
+    data = bytes((i * 37 + 11) % 256 for i in range(length))
+    # All 0xFF words overflow 16 bits many times over
+    saturated = b"\xff" * length
+
+    assert calculate_klv_checksum(data) == _reference_checksum(data)
+    assert calculate_klv_checksum(saturated) == _reference_checksum(saturated)
+    assert calculate_klv_checksum(memoryview(data)) == _reference_checksum(data)
+
+
+class _StopBuild(Exception):
+    pass
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_build_klv_video_parallel_encode_is_opt_in(monkeypatch, tmp_path, parallel):
+    """Test that build_klv_video only asks for a process pool when told to."""
+    requested = []
+
+    def fake_create_packets(self, metadata_per_frame, parallel=False):
+        requested.append(parallel)
+        raise _StopBuild
+
+    monkeypatch.setattr(KLVMetadataGenerator, "create_packets", fake_create_packets)
+    kwargs = {"parallel": True} if parallel else {}
+
+    with pytest.raises(_StopBuild):
+        build_klv_video(str(tmp_path / "out.ts"), [{}] * 3, backend="ffmpeg", **kwargs)
+
+    assert requested == [parallel]
+
+
+class _FakeFFmpeg:
+    """Stand-in for the FFmpeg encoder process fed by build_klv_video."""
+
+    instances = []
+
+    def __init__(self, cmd, stdin, stdout, stderr, returncode=0, message=b""):
+        self.stdin = io.BytesIO()
+        self.returncode = None
+        self.killed = False
+        self._exit_code = returncode
+        stderr.write(message)
+        _FakeFFmpeg.instances.append(self)
+
+    def kill(self):
+        self.killed = True
+        self._exit_code = -9
+
+    def wait(self):
+        self.returncode = self._exit_code
+        return self.returncode
+
+
+@pytest.fixture
+def fake_ffmpeg_popen(monkeypatch):
+    """Replace the FFmpeg process; call with Popen keyword overrides."""
+    _FakeFFmpeg.instances = []
+
+    def install(**overrides):
+        monkeypatch.setattr(
+            subprocess,
+            "Popen",
+            lambda cmd, **kwargs: _FakeFFmpeg(cmd, **kwargs, **overrides),
+        )
+        return _FakeFFmpeg.instances
+
+    return install
+
+
+class _WrongSizeFrames(VideoFrameGenerator):
+    def generate_frame(self, frame_num, total_frames, custom_text=None):
+        return np.zeros((self.height, self.width + 1, 3), dtype=np.uint8)
+
+
+def test_build_klv_video_rejects_wrong_frame_size(fake_ffmpeg_popen, tmp_path):
+    """Test that a frame not matching -s WxH stops the build and kills FFmpeg."""
+    processes = fake_ffmpeg_popen()
+
+    with pytest.raises(ValueError, match="Frame 0 has shape"):
+        build_klv_video(
+            str(tmp_path / "out.ts"),
+            [{}] * 2,
+            width=32,
+            height=16,
+            frame_generator=_WrongSizeFrames(32, 16),
+            backend="ffmpeg",
+        )
+
+    assert processes[0].killed
+    assert processes[0].returncode is not None
+    assert processes[0].stdin.closed
+
+
+def test_build_klv_video_reports_ffmpeg_errors(fake_ffmpeg_popen, tmp_path, capsys):
+    """Test that FFmpeg's stderr is printed when it exits with an error."""
+    processes = fake_ffmpeg_popen(returncode=1, message=b"Unknown encoder 'libx264'")
+
+    result = build_klv_video(
+        str(tmp_path / "out.ts"), [{}] * 2, width=32, height=16, backend="ffmpeg"
+    )
+
+    out = capsys.readouterr().out
+    assert not result["success"]
+    assert "FFmpeg exited with code 1:" in out
+    assert "Unknown encoder 'libx264'" in out
+    assert not processes[0].killed
+    assert processes[0].stdin.closed
@@ -0,0 +1,220 @@
+"""Test video_modifier helpers that do not need a sample video."""
+
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from vidmeta import video_modifier
+from vidmeta.video_builder import KLVMetadataGenerator
+from vidmeta.video_modifier import (
+    StreamingFrameGenerator,
+    modify_video_metadata,
+    parse_klv_file,
+    remux_video_lossless_ffmpeg,
+    split_klv_packets,
+    stream_video,
+)
+
+
+def _solid_frames(count):
+    return [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(count)]
+
+
+def test_streaming_frame_generator_raises_past_end():
+    """Test that frames past the end of the video raise IndexError by default."""
+    frame_gen = StreamingFrameGenerator(_solid_frames(2))
+
+    assert frame_gen.generate_frame(1, 3)[0, 0, 0] == 1
+    with pytest.raises(IndexError):
+        frame_gen.generate_frame(2, 3)
+
+
+def test_parse_klv_file_parallel_matches_serial(monkeypatch, tmp_path):
+    """Test that the process pool parse gives the same result as parsing serially."""
+    metadata = [
+        {"latitude": 37.0 + n / 100, "sensor_name": f"EO{n}", "heading": n % 360}
+        for n in range(150)
+    ]
+    klv_path = tmp_path / "stream.klv"
+    klv_path.write_bytes(b"".join(KLVMetadataGenerator().create_packets(metadata)))
+
+    pools = []
+
+    class RecordingExecutor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(video_modifier, "ProcessPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(video_modifier, "_PARALLEL_PARSE_MIN_PACKETS", 100)
+    monkeypatch.setattr(video_modifier.os, "cpu_count", lambda: 2)
+
+    serial = parse_klv_file(str(klv_path))
+    assert pools == []
+    parallel = parse_klv_file(str(klv_path), parallel=True)
+
+    assert len(pools) == 1
+    assert list(parallel) == list(serial) == list(range(150))
+    assert parallel == serial
+
+
+def _write_mjpg(path, num_frames):
+    """Write a small MJPG video in the container named by the file extension.
+
+    Matroska (.mkv) records no frame count; AVI (.avi) does.
+    """
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for frame in _solid_frames(num_frames):
+        writer.write(cv2.resize(frame, (64, 48)))
+    writer.release()
+
+
+def test_stream_video_pyav_counts_frames(tmp_path):
+    """Test that the PyAV decoder reports the frames it actually decodes."""
+    pytest.importorskip("av")
+    video_path = tmp_path / "frames.mkv"
+    _write_mjpg(video_path, 7)
+
+    frames, properties = stream_video(str(video_path), decoder="pyav")
+    decoded = list(frames)
+
+    assert properties["num_frames"] == len(decoded) == 7
+    assert (properties["width"], properties["height"]) == (64, 48)
+    assert decoded[0].shape == (48, 64, 3)
+
+
+def test_stream_video_pyav_uses_recorded_frame_count(monkeypatch, tmp_path):
+    """Test that PyAV only counts packets when the container has no frame count."""
+    pytest.importorskip("av")
+    video_path = tmp_path / "frames.avi"
+    _write_mjpg(video_path, 5)
+
+    def no_second_pass(av, video_path):
+        raise AssertionError("AVI records its frame count; no demux pass needed")
+
+    monkeypatch.setattr(video_modifier, "_count_video_packets", no_second_pass)
+
+    frames, properties = stream_video(str(video_path), decoder="pyav")
+
+    assert properties["num_frames"] == len(list(frames)) == 5
+
+
+def test_stream_video_rejects_unknown_decoder(tmp_path):
+    """Test that an unknown decoder name raises ValueError."""
+    with pytest.raises(ValueError, match="Unknown decoder"):
+        stream_video(str(tmp_path / "missing.mkv"), decoder="gpu")
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Record FFmpeg command lines instead of running them.
+
+    Extraction commands (writing to pipe:1) get fake_ffmpeg.klv_stream as output.
+    """
+    ffmpeg = SimpleNamespace(commands=[], klv_stream=b"")
+
+    def fake_run(cmd, **kwargs):
+        ffmpeg.commands.append(cmd)
+        stdout = ffmpeg.klv_stream if cmd[-1] == "pipe:1" else None
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=b"")
+
+    monkeypatch.setattr(video_modifier.subprocess, "run", fake_run)
+    return ffmpeg
+
+
+def _remux_command(input_path, klv_path, output_path):
+    return [
+        "ffmpeg",
+        "-y",
+        "-i",
+        input_path,
+        "-f",
+        "data",
+        "-i",
+        klv_path,
+        "-map",
+        "0:v",
+        "-map",
+        "0:a?",
+        "-map",
+        "1:0",
+        "-c:v",
+        "copy",
+        "-c:a",
+        "copy",
+        "-c:d",
+        "copy",
+        "-metadata:s:d:0",
+        "language=klv",
+        "-f",
+        "mpegts",
+        output_path,
+    ]
+
+
+def test_remux_video_lossless_ffmpeg_command(fake_ffmpeg, tmp_path):
+    """Test the FFmpeg stream-copy command line and the KLV sidecar it reads."""
+    metadata = [{"latitude": 37.0 + n} for n in range(3)]
+    output_path = str(tmp_path / "out.ts")
+
+    result = remux_video_lossless_ffmpeg("in.ts", output_path, metadata)
+
+    klv_path = str(tmp_path / "out.klv")
+    assert fake_ffmpeg.commands == [_remux_command("in.ts", klv_path, output_path)]
+    expected_stream = b"".join(KLVMetadataGenerator().create_packets(metadata))
+    assert (tmp_path / "out.klv").read_bytes() == expected_stream
+    assert result["success"] and result["lossless"]
+    assert result["num_frames"] == 3
+    assert result["total_klv_bytes"] == len(expected_stream)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_remux_video_lossless_ffmpeg_parallel_is_opt_in(
+    fake_ffmpeg, monkeypatch, tmp_path, parallel
+):
+    """Test that the FFmpeg remux only asks for a process pool when told to."""
+    requested = []
+    create_packets = KLVMetadataGenerator.create_packets
+
+    def recording_create_packets(self, metadata_per_frame, parallel=False):
+        requested.append(parallel)
+        return create_packets(self, metadata_per_frame)
+
+    monkeypatch.setattr(
+        KLVMetadataGenerator, "create_packets", recording_create_packets
+    )
+    kwargs = {"parallel": True} if parallel else {}
+
+    remux_video_lossless_ffmpeg("in.ts", str(tmp_path / "out.ts"), [{}], **kwargs)
+
+    assert requested == [parallel]
+
+
+def test_modify_lossless_ffmpeg_backend(fake_ffmpeg, tmp_path):
+    """Test that lossless modification with backend='ffmpeg' remuxes via FFmpeg."""
+    input_path = str(tmp_path / "in.mkv")
+    _write_mjpg(input_path, 4)
+    klv_gen = KLVMetadataGenerator()
+    original = klv_gen.create_packets([{"latitude": 10.0 + n} for n in range(4)])
+    fake_ffmpeg.klv_stream = b"".join(original)
+    output_path = str(tmp_path / "out.ts")
+
+    result = modify_video_metadata(
+        input_path, output_path, {2: {"heading": 90.0}}, backend="ffmpeg"
+    )
+
+    klv_path = str(tmp_path / "out.klv")
+    assert fake_ffmpeg.commands[-1] == _remux_command(input_path, klv_path, output_path)
+    assert result["lossless"] and result["num_frames"] == 4
+    packets = split_klv_packets((tmp_path / "out.klv").read_bytes())
+    original_values = split_klv_packets(fake_ffmpeg.klv_stream)
+    # Frames without overrides pass through byte for byte
+    for frame_num in (0, 1, 3):
+        assert packets[frame_num] == original_values[frame_num]
+    modified, _, _ = video_modifier.parse_klv_packet(packets[2])
+    assert modified["heading"] == pytest.approx(90.0, abs=0.01)
+    assert modified["latitude"] == pytest.approx(12.0, abs=1e-6)
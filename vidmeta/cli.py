@@ -2,14 +2,16 @@
 
 import argparse
 import sys
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from .scenarios import SCENARIOS, get_scenario
-from .video_builder import build_klv_video
 
 
-def main(argv: Optional[list] = None):
-    """Main CLI entry point."""
+@lru_cache(maxsize=None)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once per process and reuse it."""
     parser = argparse.ArgumentParser(
         description="Generate test videos with KLV metadata streams",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -38,7 +40,10 @@ Examples:
     parser.add_argument(
         "-o",
         "--output",
-        help="Output video file path (default: scenario-specific name)",
+        help=(
+            "Output video file path (default: scenario-specific name). "
+            "With --all, the scenario name is appended to the file name"
+        ),
         type=str,
     )
 
@@ -70,6 +75,12 @@ Examples:
         help="Muxing backend: gstreamer (proper KLVA tags, default) or ffmpeg (basic)",
     )
 
+    return parser
+
+
+def main(argv: Optional[list] = None):
+    """Main CLI entry point."""
+    parser = _get_parser()
     args = parser.parse_args(argv)
 
     # List scenarios
@@ -83,17 +94,30 @@ Examples:
             print()
         return 0
 
+    # Deferred so --help and --list don't pay for numpy, klvdata and OpenCV
+    from .video_builder import build_klv_video
+
     # Generate all scenarios
     if args.all:
-        print(f"Generating {len(SCENARIOS)} test scenarios...")
+        total = len(SCENARIOS)
+        base_output = Path(args.output) if args.output else None
+        print(f"Generating {total} test scenarios...")
         print()
 
         for i, (name, info) in enumerate(SCENARIOS.items(), 1):
-            print(f"[{i}/{len(SCENARIOS)}] {info['name']}")
+            print(f"[{i}/{total}] {info['name']}")
             print(f"  {info['description']}")
 
             metadata = info["generator"]()
-            output = args.output if args.output else info["default_output"]
+            if base_output is None:
+                output = info["default_output"]
+            else:
+                # One file per scenario, so they don't overwrite each other
+                output = str(
+                    base_output.with_name(
+                        f"{base_output.stem}_{name}{base_output.suffix}"
+                    )
+                )
 
             result = build_klv_video(
                 output_path=output,
@@ -102,6 +126,9 @@ Examples:
                 height=args.height,
                 fps=args.fps,
                 backend=args.backend,
+                # The CLI process has no threads or pipelines yet, so it is
+                # safe to fork encode workers
+                parallel=True,
             )
 
             print(f"  ✓ Generated: {result['video_path']}")
@@ -113,7 +140,7 @@ Examples:
             )
             print()
 
-        print(f"All {len(SCENARIOS)} scenarios generated successfully!")
+        print(f"All {total} scenarios generated successfully!")
         return 0
 
     # Generate single scenario
@@ -143,6 +170,7 @@ Examples:
         height=args.height,
         fps=args.fps,
         backend=args.backend,
+        parallel=True,
     )
 
     if result["success"]:
@@ -10,8 +10,9 @@ Installation requirements:
 """
 
 import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 
@@ -40,18 +41,67 @@ def check_gstreamer():
         )
 
 
+def _init_gstreamer():
+    """Check GStreamer is available and initialize it once per process."""
+    check_gstreamer()
+    if not Gst.is_initialized():
+        Gst.init(None)
+
+
+# Candidate encoders in order of preference:
+# (pipeline fragment, parser, element factories the fragment needs)
+# Configure for better seeking: all frames as keyframes
+_ENCODERS = [
+    (
+        "openh264enc gop-size=1 ! video/x-h264,stream-format=byte-stream ! "
+        "h264parse config-interval=-1",
+        None,
+        ("openh264enc", "h264parse"),
+    ),  # Force all I-frames with gop-size=1
+    ("theoraenc", None, ("theoraenc",)),  # Theora doesn't need parse
+]
+
+# Elements every muxing pipeline needs regardless of encoder
+_PIPELINE_ELEMENTS = ("appsrc", "videoconvert", "mpegtsmux", "filesink")
+
+
+@lru_cache(maxsize=None)
+def _find_encoder() -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Pick the first installed encoder from _ENCODERS.
+
+    Installed plugins don't change within a process, so the registry is only
+    consulted once. Requires Gst.init() to have been called.
+
+    Returns:
+        (encoder, parser) pipeline fragments, or None if no candidate is usable
+    """
+    missing = [name for name in _PIPELINE_ELEMENTS if not Gst.ElementFactory.find(name)]
+    if missing:
+        print(f"Missing GStreamer elements: {', '.join(missing)}")
+        return None
+
+    for encoder, parser, factories in _ENCODERS:
+        missing = [name for name in factories if not Gst.ElementFactory.find(name)]
+        if not missing:
+            return encoder, parser
+        print(f"Encoder {encoder} not available: missing {', '.join(missing)}")
+
+    return None
+
+
 class GStreamerKLVMuxer:
     """
     GStreamer-based KLV muxer for proper KLVA codec tagging.
     """
 
     def __init__(self):
-        check_gstreamer()
-        Gst.init(None)
+        _init_gstreamer()
         self.klv_gen = KLVMetadataGenerator()
         self.loop = None
         self.pipeline = None
         self.error = None
+        self.push_error = None
 
     def build_video(
         self,
@@ -83,35 +133,41 @@ class GStreamerKLVMuxer:
         num_frames = len(metadata_per_frame)
 
         if frame_generator is None:
-            frame_generator = VideoFrameGenerator(width, height)
+            # Each frame is copied into its Gst.Buffer before the next one is
+            # generated, so one buffer serves them all
+            frame_generator = VideoFrameGenerator(width, height, reuse_buffer=True)
 
         print(f"Generating {num_frames} frames with GStreamer...")
 
-        # Generate frames
-        frames = []
-        for i in range(num_frames):
-            frame = frame_generator.generate_frame(i, num_frames)
-            frames.append(frame)
+        # Generate frames lazily as the pipeline asks for them, so only the
+        # frame being pushed needs to be held in memory
+        frames = (
+            frame_generator.generate_frame(i, num_frames) for i in range(num_frames)
+        )
 
         # Generate KLV packets
-        klv_packets = []
-        for metadata in metadata_per_frame:
-            packet = self.klv_gen.create_packet_from_dict(metadata)
-            klv_packets.append(packet)
+        klv_packets = self.klv_gen.create_packets(metadata_per_frame)
 
-        total_klv_bytes = sum(len(p) for p in klv_packets)
+        # Serialize the whole stream once; the per-packet list is kept for the
+        # appsrc pushes, which need one buffer per packet anyway
+        klv_stream = b"".join(klv_packets)
+        total_klv_bytes = len(klv_stream)
 
         # Save KLV to separate file
         klv_output = Path(output_path).with_suffix(".klv")
-        with open(klv_output, "wb") as f:
-            for packet in klv_packets:
-                f.write(packet)
+        klv_output.write_bytes(klv_stream)
 
         # Build and run pipeline
+        self.push_error = None
         success = self._run_pipeline(
             frames, klv_packets, output_path, width, height, fps, synchronous_klv
         )
 
+        # Frames are generated on GStreamer's streaming thread, where PyGObject
+        # would swallow an exception; surface it here instead
+        if self.push_error is not None:
+            raise self.push_error
+
         return {
             "success": success,
             "video_path": output_path,
@@ -123,7 +179,7 @@ class GStreamerKLVMuxer:
 
     def _run_pipeline(
         self,
-        frames: List[np.ndarray],
+        frames: Iterator[np.ndarray],
         klv_packets: List[bytes],
         output_path: str,
         width: int,
@@ -133,16 +189,12 @@ class GStreamerKLVMuxer:
     ) -> bool:
         """Build and run GStreamer pipeline."""
 
-        # Build pipeline string - try different encoders
-        # Configure for better seeking: all frames as keyframes
-        encoders = [
-            (
-                "openh264enc gop-size=1 ! video/x-h264,stream-format=byte-stream ! "
-                "h264parse config-interval=-1",
-                None,
-            ),  # Force all I-frames with gop-size=1
-            ("theoraenc", None),  # Theora doesn't need parse
-        ]
+        encoder_spec = _find_encoder()
+        if encoder_spec is None:
+            print("No suitable encoder found")
+            return False
+        encoder, parser = encoder_spec
+        print(f"Using encoder: {encoder}")
 
         # KLV caps: synchronous (stream_type=21) vs asynchronous (default, stream_type=6)
         # Per MISB ST 1402, stream_type=21 (0x15) is for synchronous metadata
@@ -151,32 +203,17 @@ class GStreamerKLVMuxer:
         if synchronous_klv:
             klv_caps = "meta/x-klv,parsed=true,stream_type=21"
 
-        pipeline_desc = None
-        for encoder, parser in encoders:
-            parse_str = f"{parser} ! " if parser else ""
-            test_desc = (
-                f"appsrc name=videosrc format=time "
-                f"caps=video/x-raw,format=BGR,width={width},height={height},framerate={fps}/1 ! "
-                f"videoconvert ! "
-                f"{encoder} ! "
-                f"{parse_str}"
-                f"mpegtsmux name=mux ! "
-                f"filesink location={output_path} "
-                f"appsrc name=klvsrc format=time caps={klv_caps} ! mux."
-            )
-            try:
-                test_pipeline = Gst.parse_launch(test_desc)
-                pipeline_desc = test_desc
-                del test_pipeline
-                print(f"Using encoder: {encoder}")
-                break
-            except Exception as e:
-                print(f"Encoder {encoder} not available: {e}")
-                continue
-
-        if not pipeline_desc:
-            print("No suitable encoder found")
-            return False
+        parse_str = f"{parser} ! " if parser else ""
+        pipeline_desc = (
+            f"appsrc name=videosrc format=time "
+            f"caps=video/x-raw,format=BGR,width={width},height={height},framerate={fps}/1 ! "
+            f"videoconvert ! "
+            f"{encoder} ! "
+            f"{parse_str}"
+            f"mpegtsmux name=mux ! "
+            f"filesink location={output_path} "
+            f"appsrc name=klvsrc format=time caps={klv_caps} ! mux."
+        )
 
         print(f"Pipeline: {pipeline_desc}")
 
@@ -202,6 +239,10 @@ class GStreamerKLVMuxer:
         bus.add_signal_watch()
         bus.connect("message", self._on_message)
 
+        # Create the main loop before starting the pipeline, so a failing
+        # need-data callback always has a loop to stop
+        self.loop = GLib.MainLoop()
+
         # Start pipeline
         print("Starting pipeline...")
         ret = self.pipeline.set_state(Gst.State.PLAYING)
@@ -210,7 +251,6 @@ class GStreamerKLVMuxer:
             return False
 
         # Run main loop in a thread
-        self.loop = GLib.MainLoop()
         loop_thread = threading.Thread(target=self.loop.run)
         loop_thread.start()
 
@@ -228,17 +268,36 @@ class GStreamerKLVMuxer:
         frame_idx = [0]
         klv_idx = [0]
 
+        # Timestamps are fixed by frame index, so compute them once up front.
+        # Use i * SECOND // fps rather than i * duration: the latter drifts when
+        # fps doesn't divide a second evenly.
+        duration = Gst.SECOND // fps
+        pts_table = [i * Gst.SECOND // fps for i in range(len(klv_packets))]
+        num_pts = len(pts_table)
+
         def push_video_data(src):
-            if frame_idx[0] >= len(frames):
+            try:
+                frame = next(frames, None)
+            except Exception as e:
+                # Record the error for build_video to re-raise, then finish the
+                # stream and stop the loop so loop_thread.join() returns.
+                # idle_add makes the quit stick even if the loop isn't running yet.
+                print(f"Failed to generate video frame {frame_idx[0]}: {e}")
+                self.push_error = e
+                src.emit("end-of-stream")
+                GLib.idle_add(self.loop.quit)
+                return False
+
+            if frame is None:
                 src.emit("end-of-stream")
                 return False
 
-            frame = frames[frame_idx[0]]
             data = frame.tobytes()
 
+            index = frame_idx[0]
             buf = Gst.Buffer.new_wrapped(data)
-            buf.pts = frame_idx[0] * Gst.SECOND // fps
-            buf.duration = Gst.SECOND // fps
+            buf.pts = pts_table[index] if index < num_pts else index * Gst.SECOND // fps
+            buf.duration = duration
 
             ret = src.emit("push-buffer", buf)
             if ret != Gst.FlowReturn.OK:
@@ -249,15 +308,16 @@ class GStreamerKLVMuxer:
             return True
 
         def push_klv_data(src):
-            if klv_idx[0] >= len(klv_packets):
+            index = klv_idx[0]
+            if index >= num_pts:
                 src.emit("end-of-stream")
                 return False
 
-            packet = klv_packets[klv_idx[0]]
+            packet = klv_packets[index]
 
             buf = Gst.Buffer.new_wrapped(packet)
-            buf.pts = klv_idx[0] * Gst.SECOND // fps
-            buf.duration = Gst.SECOND // fps
+            buf.pts = pts_table[index]
+            buf.duration = duration
 
             ret = src.emit("push-buffer", buf)
             if ret != Gst.FlowReturn.OK:
@@ -335,8 +395,7 @@ class GStreamerLosslessRemuxer:
     """
 
     def __init__(self):
-        check_gstreamer()
-        Gst.init(None)
+        _init_gstreamer()
         self.klv_gen = KLVMetadataGenerator()
         self.loop = None
         self.pipeline = None
@@ -462,6 +521,9 @@ def remux_video_lossless(
     Remux video with new KLV metadata without re-encoding video frames.
 
     This preserves original video quality exactly - only the KLV metadata is replaced.
+    Only the H.264 video stream is carried over: audio and any other streams in
+    the input are dropped. The ffmpeg backend (remux_video_lossless_ffmpeg)
+    keeps audio.
 
     Args:
         input_path: Input video file path (.mpg, .ts)
@@ -475,17 +537,17 @@ def remux_video_lossless(
     """
     klv_gen = KLVMetadataGenerator()
 
-    klv_packets = []
-    for metadata in metadata_per_frame:
-        packet = klv_gen.create_packet_from_dict(metadata)
-        klv_packets.append(packet)
+    # Generate KLV packets (serially: this process runs a GStreamer pipeline
+    # and should not fork)
+    klv_packets = klv_gen.create_packets(metadata_per_frame)
 
-    total_klv_bytes = sum(len(p) for p in klv_packets)
+    # Serialize the whole stream once; the remuxer still takes the per-packet
+    # list, one buffer per packet
+    klv_stream = b"".join(klv_packets)
+    total_klv_bytes = len(klv_stream)
 
     klv_output = Path(output_path).with_suffix(".klv")
-    with open(klv_output, "wb") as f:
-        for packet in klv_packets:
-            f.write(packet)
+    klv_output.write_bytes(klv_stream)
 
     remuxer = GStreamerLosslessRemuxer()
     success = remuxer.remux_with_new_klv(
@@ -7,6 +7,7 @@ type-safe Pydantic models defined in models.py.
 
 from typing import Dict, Any, Tuple
 from datetime import datetime
+from functools import lru_cache
 
 from klvdata import misb0601
 
@@ -19,38 +20,69 @@ from .models import (
 )
 
 
+# Tag keys repeat identically on every packet, so both conversions are cached
+@lru_cache(maxsize=512)
 def _tag_key_to_num(tag_key: bytes) -> int:
     """Convert tag key bytes to tag number."""
     return int.from_bytes(tag_key, "big")
 
 
-def _extract_unknown_tags(raw_packet: bytes) -> Dict[str, bytes]:
+@lru_cache(maxsize=512)
+def _tag_key_hex(tag_key: bytes) -> str:
+    """Convert tag key bytes to the hex string used in unknown tag dicts."""
+    return tag_key.hex()
+
+
+def _collect_unknown_tags(uas_set, known_tag_numbers) -> Dict[str, bytes]:
     """
-    Extract unknown KLV tags from a raw packet.
+    Collect the tags of a parsed local set that klvdata has no parser for.
 
     Args:
-        raw_packet: Raw KLV packet bytes
+        uas_set: Parsed misb0601.UASLocalMetadataSet
+        known_tag_numbers: Tag numbers reported by uas_set.MetadataList()
 
     Returns:
         Dictionary mapping tag hex strings to raw tag bytes
     """
-    uas_set = misb0601.UASLocalMetadataSet(raw_packet)
-    metadata_dict = uas_set.MetadataList()
-
-    # Build set of known tag numbers
-    known_tag_numbers = set(metadata_dict.keys())
-
     unknown_tags = {}
     for tag_key, element in uas_set.items.items():
         tag_num = _tag_key_to_num(tag_key)
 
         # Skip tags we've already processed (tag 1 = checksum)
         if tag_num not in known_tag_numbers and tag_num != 1:
-            unknown_tags[tag_key.hex()] = bytes(element)
+            unknown_tags[_tag_key_hex(tag_key)] = bytes(element)
 
     return unknown_tags
 
 
+def _extract_unknown_tags(raw_packet: bytes) -> Dict[str, bytes]:
+    """
+    Extract unknown KLV tags from a raw packet.
+
+    Args:
+        raw_packet: Raw KLV packet bytes
+
+    Returns:
+        Dictionary mapping tag hex strings to raw tag bytes
+    """
+    uas_set = misb0601.UASLocalMetadataSet(raw_packet)
+    return _collect_unknown_tags(uas_set, uas_set.MetadataList().keys())
+
+
+# Timestamps repeat when several packets share a frame time, and the version
+# string is constant across a video; both parses are pure
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value_str: str) -> datetime:
+    """Parse a klvdata ISO timestamp string."""
+    return datetime.fromisoformat(value_str)
+
+
+@lru_cache(maxsize=64)
+def _parse_version(value_str: str) -> int:
+    """Parse a klvdata version number string."""
+    return int(float(value_str))
+
+
 # Mapping from MISB field names to (section, field_name, type_converter)
 FIELD_MAPPINGS = {
     # Platform fields
@@ -81,69 +113,117 @@ FIELD_MAPPINGS = {
     "Frame Center Elevation": ("frame", "frame_center_elevation", float),
 }
 
+# FIELD_MAPPINGS resolved for the parse loop: sections become indexes into the
+# per-packet (platform, sensor, frame) dicts
+_SECTIONS = ("platform", "sensor", "frame")
+_FIELD_DISPATCH = {
+    name: (_SECTIONS.index(section), field, type_func)
+    for name, (section, field, type_func) in FIELD_MAPPINGS.items()
+}
+
+# Flat dict key -> section index, for routing flat dicts into the section models
+_FLAT_KEY_SECTIONS = {
+    field: _SECTIONS.index(section) for section, field, _ in FIELD_MAPPINGS.values()
+}
+
 
-def parse_klv_packet_to_pydantic(packet: bytes) -> ParsedKLVPacket:
+def parse_klv_packet_full(packet: bytes) -> Tuple[ParsedKLVPacket, Dict[str, bytes]]:
     """
-    Parse a KLV packet into a Pydantic model with separate raw packet storage.
+    Parse a KLV packet into a Pydantic model and its unknown tags in one pass.
 
     Args:
         packet: Raw KLV packet bytes
 
     Returns:
-        ParsedKLVPacket containing structured metadata and raw bytes
+        Tuple of (parsed, unknown_tags) where parsed is the ParsedKLVPacket and
+        unknown_tags is a dict of {tag_hex: tag_bytes} for tags klvdata can't name
     """
     # Parse using klvdata
     uas_set = misb0601.UASLocalMetadataSet(packet)
     metadata_dict = uas_set.MetadataList()
 
-    # Build nested dict for Pydantic model
-    parsed = {"platform": {}, "sensor": {}, "frame": {}}
-
-    # Extract all tag numbers we know about (for unknown tag detection)
-    known_tag_numbers = set()
+    # Build nested dicts for Pydantic model
+    parsed = {}
+    degenerate = False  # Set when a value is kept as an unconverted string
+    sections = ({}, {}, {})  # platform, sensor, frame
+    get_entry = _FIELD_DISPATCH.get
 
-    for tag_num, tag_info in metadata_dict.items():
+    for tag_info in metadata_dict.values():
         name = tag_info[0]  # First element is the name
         value_str = tag_info[3]  # Fourth element is the value as string
-        known_tag_numbers.add(tag_num)
+
+        # Map fields using mapping table
+        entry = get_entry(name)
+        if entry is not None:
+            section_idx, field, type_func = entry
+            if type_func is str:
+                sections[section_idx][field] = value_str
+                continue
+            try:
+                sections[section_idx][field] = type_func(value_str)
+            except (ValueError, TypeError):
+                # For degenerate test values, store as string
+                sections[section_idx][field] = value_str
+                degenerate = True
+            continue
 
         # Handle timestamps specially
         if name in ("Precision Time Stamp", "Event Start Time - UTC"):
             try:
                 # klvdata returns ISO format like '2015-10-07 07:18:02.380305+00:00'
-                parsed["timestamp"] = datetime.fromisoformat(value_str)
+                parsed["timestamp"] = _parse_timestamp(value_str)
             except (ValueError, OSError):
                 # If parsing fails, keep as string (for degenerate test cases)
                 parsed["timestamp"] = value_str
+                degenerate = True
             continue
 
         # Handle version
         if name == "UAS Datalink LS Version Number":
             try:
-                parsed["version"] = int(float(value_str))
+                parsed["version"] = _parse_version(value_str)
             except (ValueError, TypeError):
                 parsed["version"] = value_str  # Allow degenerate values
-            continue
+                degenerate = True
+
+    # Create Pydantic models. Every value was already converted to its field's
+    # type above, so validation only needs to run for degenerate strings.
+    if degenerate:
+        metadata = KLVMetadata(
+            timestamp=parsed.get("timestamp"),
+            version=parsed.get("version"),
+            platform=PlatformMetadata(**sections[0]),
+            sensor=SensorMetadata(**sections[1]),
+            frame=FrameMetadata(**sections[2]),
+        )
+    else:
+        metadata = KLVMetadata.model_construct(
+            timestamp=parsed.get("timestamp"),
+            version=parsed.get("version"),
+            platform=PlatformMetadata.model_construct(**sections[0]),
+            sensor=SensorMetadata.model_construct(**sections[1]),
+            frame=FrameMetadata.model_construct(**sections[2]),
+        )
+
+    unknown_tags = _collect_unknown_tags(uas_set, metadata_dict.keys())
+
+    parsed_packet = ParsedKLVPacket(metadata=metadata, raw_packet=packet)
+    # Reuse this parse for pydantic_to_flat_dict's unknown tag extraction
+    parsed_packet._unknown_tags = unknown_tags
+    return parsed_packet, unknown_tags
 
-        # Map other fields using mapping table
-        if name in FIELD_MAPPINGS:
-            section, field, type_func = FIELD_MAPPINGS[name]
-            try:
-                parsed[section][field] = type_func(value_str)
-            except (ValueError, TypeError):
-                # For degenerate test values, store as string
-                parsed[section][field] = value_str
 
-    # Create Pydantic models
-    metadata = KLVMetadata(
-        timestamp=parsed.get("timestamp"),
-        version=parsed.get("version"),
-        platform=PlatformMetadata(**parsed["platform"]),
-        sensor=SensorMetadata(**parsed["sensor"]),
-        frame=FrameMetadata(**parsed["frame"]),
-    )
+def parse_klv_packet_to_pydantic(packet: bytes) -> ParsedKLVPacket:
+    """
+    Parse a KLV packet into a Pydantic model with separate raw packet storage.
 
-    return ParsedKLVPacket(metadata=metadata, raw_packet=packet)
+    Args:
+        packet: Raw KLV packet bytes
+
+    Returns:
+        ParsedKLVPacket containing structured metadata and raw bytes
+    """
+    return parse_klv_packet_full(packet)[0]
 
 
 def pydantic_to_flat_dict(
@@ -164,44 +244,26 @@ def pydantic_to_flat_dict(
     """
     metadata = parsed.metadata
 
-    # Build result dict, excluding None values from the start
-    result = {
-        k: v
-        for k, v in {
-            "timestamp": metadata.timestamp,
-            "version": metadata.version,
-            # Platform fields
-            "mission_id": metadata.platform.mission_id,
-            "platform_designation": metadata.platform.platform_designation,
-            "platform_call_sign": metadata.platform.platform_call_sign,
-            "platform_tail_number": metadata.platform.platform_tail_number,
-            "latitude": metadata.platform.latitude,
-            "longitude": metadata.platform.longitude,
-            "altitude": metadata.platform.altitude,
-            "heading": metadata.platform.heading,
-            "pitch": metadata.platform.pitch,
-            "roll": metadata.platform.roll,
-            "platform_ground_speed": metadata.platform.platform_ground_speed,
-            # Sensor fields
-            "sensor_name": metadata.sensor.sensor_name,
-            "sensor_relative_azimuth": metadata.sensor.sensor_relative_azimuth,
-            "sensor_relative_elevation": metadata.sensor.sensor_relative_elevation,
-            "sensor_relative_roll": metadata.sensor.sensor_relative_roll,
-            "horizontal_fov": metadata.sensor.horizontal_fov,
-            "vertical_fov": metadata.sensor.vertical_fov,
-            "slant_range": metadata.sensor.slant_range,
-            "target_width": metadata.sensor.target_width,
-            "ground_range": metadata.sensor.ground_range,
-            # Frame fields
-            "frame_center_latitude": metadata.frame.frame_center_latitude,
-            "frame_center_longitude": metadata.frame.frame_center_longitude,
-            "frame_center_elevation": metadata.frame.frame_center_elevation,
-        }.items()
-        if v is not None
-    }
-
-    # Extract unknown tags if requested
-    unknown_tags = _extract_unknown_tags(parsed.raw_packet) if include_unknown_tags else {}
+    # Build result dict, excluding None values from the start. Section field
+    # names are the flat keys, so read them straight from each model's
+    # __dict__ (declaration order) rather than via per-field attribute access.
+    result = {}
+    if metadata.timestamp is not None:
+        result["timestamp"] = metadata.timestamp
+    if metadata.version is not None:
+        result["version"] = metadata.version
+    for section in (metadata.platform, metadata.sensor, metadata.frame):
+        for key, value in section.__dict__.items():
+            if value is not None:
+                result[key] = value
+
+    # Extract unknown tags if requested, reusing the parser's result when present
+    if not include_unknown_tags:
+        unknown_tags = {}
+    elif parsed._unknown_tags is not None:
+        unknown_tags = dict(parsed._unknown_tags)
+    else:
+        unknown_tags = _extract_unknown_tags(parsed.raw_packet)
 
     return result, parsed.raw_packet, unknown_tags
 
@@ -219,47 +281,20 @@ def flat_dict_to_pydantic(
     Returns:
         ParsedKLVPacket instance
     """
-    # Build nested structure
-    parsed = {
-        "timestamp": flat_dict.get("timestamp"),
-        "version": flat_dict.get("version"),
-        "platform": {
-            "mission_id": flat_dict.get("mission_id"),
-            "platform_designation": flat_dict.get("platform_designation"),
-            "platform_call_sign": flat_dict.get("platform_call_sign"),
-            "platform_tail_number": flat_dict.get("platform_tail_number"),
-            "latitude": flat_dict.get("latitude"),
-            "longitude": flat_dict.get("longitude"),
-            "altitude": flat_dict.get("altitude"),
-            "heading": flat_dict.get("heading"),
-            "pitch": flat_dict.get("pitch"),
-            "roll": flat_dict.get("roll"),
-            "platform_ground_speed": flat_dict.get("platform_ground_speed"),
-        },
-        "sensor": {
-            "sensor_name": flat_dict.get("sensor_name"),
-            "sensor_relative_azimuth": flat_dict.get("sensor_relative_azimuth"),
-            "sensor_relative_elevation": flat_dict.get("sensor_relative_elevation"),
-            "sensor_relative_roll": flat_dict.get("sensor_relative_roll"),
-            "horizontal_fov": flat_dict.get("horizontal_fov"),
-            "vertical_fov": flat_dict.get("vertical_fov"),
-            "slant_range": flat_dict.get("slant_range"),
-            "target_width": flat_dict.get("target_width"),
-            "ground_range": flat_dict.get("ground_range"),
-        },
-        "frame": {
-            "frame_center_latitude": flat_dict.get("frame_center_latitude"),
-            "frame_center_longitude": flat_dict.get("frame_center_longitude"),
-            "frame_center_elevation": flat_dict.get("frame_center_elevation"),
-        },
-    }
+    # Route each present key to its section; absent fields keep their None default
+    sections = ({}, {}, {})  # platform, sensor, frame
+    get_section = _FLAT_KEY_SECTIONS.get
+    for key, value in flat_dict.items():
+        section_idx = get_section(key)
+        if section_idx is not None:
+            sections[section_idx][key] = value
 
     metadata = KLVMetadata(
-        timestamp=parsed.get("timestamp"),
-        version=parsed.get("version"),
-        platform=PlatformMetadata(**parsed["platform"]),
-        sensor=SensorMetadata(**parsed["sensor"]),
-        frame=FrameMetadata(**parsed["frame"]),
+        timestamp=flat_dict.get("timestamp"),
+        version=flat_dict.get("version"),
+        platform=PlatformMetadata(**sections[0]),
+        sensor=SensorMetadata(**sections[1]),
+        frame=FrameMetadata(**sections[2]),
     )
 
     return ParsedKLVPacket(
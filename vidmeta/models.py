@@ -6,9 +6,9 @@ the MISB ST 0601 standard. The models are organized hierarchically to separate
 platform, sensor, and frame-specific metadata.
 """
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 
 class MetadataBase(BaseModel):
@@ -143,3 +143,14 @@ class ParsedKLVPacket(BaseModel):
 
     metadata: KLVMetadata = Field(description="Structured metadata parsed from packet")
     raw_packet: bytes = Field(description="Original raw KLV packet bytes")
+
+    # Unknown tags found while parsing raw_packet, so converters don't need to
+    # parse it again. None when the packet was not built by the parser.
+    _unknown_tags: Optional[Dict[str, bytes]] = PrivateAttr(default=None)
+
+    def __eq__(self, other: object) -> bool:
+        # pydantic compares private attributes too, but _unknown_tags is only a
+        # cache derived from raw_packet, so compare the declared fields alone
+        if not isinstance(other, ParsedKLVPacket):
+            return NotImplemented
+        return self.metadata == other.metadata and self.raw_packet == other.raw_packet
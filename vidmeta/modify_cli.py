@@ -1,11 +1,143 @@
 """Command-line interface for modifying KLV metadata in existing videos."""
 
 import argparse
-import json
+import re
 import sys
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 
-from .video_modifier import modify_video_metadata
+# A --set token: identifier field name, "=", then any value (possibly empty)
+_FIELD_VALUE_RE = re.compile(r"([A-Za-z_]\w*)=(.*)", re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _get_overrides_decoder() -> Callable[[bytes], Dict[int, Dict[str, Any]]]:
+    """
+    Pick the fastest installed JSON decoder for overrides files, once per process.
+
+    Returns:
+        Function decoding overrides JSON bytes into {frame_number: fields}
+    """
+    # msgspec decodes straight into the {frame: {field: value}} shape,
+    # converting the frame keys to int as it goes
+    try:
+        import msgspec
+
+        return msgspec.json.Decoder(Dict[int, Dict[str, Any]]).decode
+    except ImportError:
+        pass
+
+    # Otherwise use a C JSON decoder for large override files when one is installed
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+
+    def decode(data: bytes) -> Dict[int, Dict[str, Any]]:
+        # Convert string keys to int
+        return {int(frame_str): fields for frame_str, fields in loads(data).items()}
+
+    return decode
+
+
+def _load_overrides(path: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Load a metadata overrides JSON file.
+
+    Args:
+        path: Path to JSON file mapping frame numbers to metadata dicts
+
+    Returns:
+        Dictionary mapping int frame numbers to metadata field updates
+    """
+    return _get_overrides_decoder()(Path(path).read_bytes())
+
+
+@lru_cache(maxsize=None)
+def _get_flat_fields() -> Dict[str, Any]:
+    """
+    Collect the flat metadata field names and their annotations from the models.
+
+    Returns:
+        Dictionary of flat field name -> type annotation
+    """
+    from pydantic import BaseModel
+
+    from .models import KLVMetadata
+
+    fields = {}
+    models = [KLVMetadata]
+    for model in models:
+        for name, field in model.model_fields.items():
+            annotation = field.annotation
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                # Nested section; its fields are top-level keys in flat dicts
+                models.append(annotation)
+            else:
+                fields[name] = annotation
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _get_valid_fields() -> frozenset:
+    """Names accepted as field in --set field=value."""
+    return frozenset(_get_flat_fields())
+
+
+@lru_cache(maxsize=None)
+def _get_field_converters() -> Dict[str, type]:
+    """
+    Map each flat metadata field name to the scalar type its model declares.
+
+    Returns:
+        Dictionary of field name -> float, int or str
+    """
+    from typing import get_args
+
+    converters = {}
+    for name, annotation in _get_flat_fields().items():
+        # Peel Optional[...]
+        scalar_types = [t for t in get_args(annotation) if t is not type(None)]
+        if scalar_types and scalar_types[0] in (float, int, str):
+            converters[name] = scalar_types[0]
+    return converters
+
+
+def _parse_field_value(field: str, value: str) -> Any:
+    """
+    Convert a --set value string to the type of its metadata field.
+
+    Args:
+        field: Flat metadata field name
+        value: Value string from the command line
+
+    Returns:
+        Converted value, or the original string if it doesn't convert
+    """
+    converter = _get_field_converters().get(field)
+    if converter is str:
+        return value
+
+    try:
+        if converter is int:
+            try:
+                return int(value)
+            except ValueError:
+                # Accept decimal spellings such as "1.0"; a fractional value
+                # stays a float, as the guess below would give
+                number = float(value)
+                return int(number) if number.is_integer() else number
+        if converter is not None:
+            return converter(value)
+        # Fields without a declared scalar type (e.g. microsecond timestamps):
+        # guess from the text
+        if "." in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        # Keep as string
+        return value
 
 
 def main(argv: Optional[list] = None):
@@ -66,7 +198,8 @@ Overrides JSON format:
         type=str,
         choices=["gstreamer", "ffmpeg"],
         default="gstreamer",
-        help="Muxing backend: gstreamer (proper KLVA tags, default) or ffmpeg (basic)",
+        help="Muxing backend: gstreamer (proper KLVA tags, default) or ffmpeg "
+        "(basic; stream-copy remux when lossless)",
     )
 
     parser.add_argument(
@@ -75,6 +208,29 @@ Overrides JSON format:
         help="Re-encode video frames (lossy). Default is lossless passthrough.",
     )
 
+    parser.add_argument(
+        "--decoder",
+        type=str,
+        choices=["opencv", "pyav"],
+        default="opencv",
+        help="Frame decoder for --re-encode: opencv (default) or pyav "
+        "(needs the 'pyav' extra)",
+    )
+
+    parser.add_argument(
+        "--hwaccel",
+        type=str,
+        help="Hardware decode device for --re-encode, e.g. cuda, vaapi or "
+        "videotoolbox (falls back to software decoding)",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Print the updated fields of every modified frame",
+    )
+
     args = parser.parse_args(argv)
 
     # Build metadata_overrides from arguments
@@ -82,11 +238,7 @@ Overrides JSON format:
 
     # Load from JSON file if provided
     if args.overrides:
-        with open(args.overrides, "r") as f:
-            json_overrides = json.load(f)
-            # Convert string keys to int
-            for frame_str, fields in json_overrides.items():
-                metadata_overrides[int(frame_str)] = fields
+        metadata_overrides.update(_load_overrides(args.overrides))
 
     # Add command-line overrides
     if args.frame_numbers and args.field_sets:
@@ -96,44 +248,43 @@ Overrides JSON format:
             )
             return 1
 
+        valid_fields = _get_valid_fields()
         for frame_num, field_set in zip(args.frame_numbers, args.field_sets):
             if frame_num not in metadata_overrides:
                 metadata_overrides[frame_num] = {}
 
             # Parse field=value pairs
             for field_value in field_set:
-                if "=" not in field_value:
+                match = _FIELD_VALUE_RE.fullmatch(field_value)
+                if match is None:
                     print(
                         f"Error: Invalid format '{field_value}', expected field=value"
                     )
                     return 1
 
-                field, value = field_value.split("=", 1)
-
-                # Try to convert to number
-                try:
-                    if "." in value:
-                        value = float(value)
-                    else:
-                        value = int(value)
-                except ValueError:
-                    # Keep as string
-                    pass
+                field, value = match.groups()
+                if field not in valid_fields:
+                    print(f"Error: Unknown metadata field '{field}'")
+                    print(f"Valid fields: {', '.join(sorted(valid_fields))}")
+                    return 1
 
-                metadata_overrides[frame_num][field] = value
+                metadata_overrides[frame_num][field] = _parse_field_value(field, value)
 
     if not metadata_overrides:
         print("Error: No metadata modifications specified.")
         print("Use --overrides <file.json> or --frame N --set field=value")
         return 1
 
+    # Deferred so --help and argument errors don't pay for klvdata, pydantic
+    # and OpenCV
+    from .video_modifier import modify_video_metadata
+
     lossless = not args.re_encode
 
     print(f"Input video:  {args.input}")
     print(f"Output video: {args.output}")
     print(f"Mode:         {'lossless (preserves video frames)' if lossless else 're-encode (lossy)'}")
-    if not lossless:
-        print(f"Backend:      {args.backend}")
+    print(f"Backend:      {args.backend}")
     print(f"Modifications: {len(metadata_overrides)} frames")
     print()
 
@@ -144,6 +295,9 @@ Overrides JSON format:
             metadata_overrides=metadata_overrides,
             backend=args.backend,
             lossless=lossless,
+            decoder=args.decoder,
+            hwaccel=args.hwaccel,
+            verbose=args.verbose,
         )
 
         print()
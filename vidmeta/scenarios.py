@@ -1,7 +1,8 @@
 """Pre-defined test scenarios for generating KLV test videos."""
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping
 
 
 def sample_video_middle_metadata() -> List[Dict[str, Any]]:
@@ -47,18 +48,20 @@ def sample_video_middle_metadata() -> List[Dict[str, Any]]:
     base_timestamp = 1444202320413948  # Unix microseconds from sample
 
     for i in range(10):
-        frame_meta = base_metadata.copy()
-
-        # Add timestamp (incremented by 40ms per frame for 25 fps)
-        frame_meta["timestamp"] = base_timestamp + (i * 40_000)
-
-        # Add small variations to simulate camera movement
-        frame_meta["heading"] += i * 0.1
-        frame_meta["pitch"] += i * 0.01
-        frame_meta["roll"] -= i * 0.02
-        frame_meta["latitude"] += i * 0.00001
-        frame_meta["longitude"] += i * 0.00001
-        frame_meta["altitude"] += i * 0.5
+        # Build each frame in one step: the shared base fields, overlaid with
+        # the varying ones (key order matches a copy-then-assign)
+        frame_meta = {
+            **base_metadata,
+            # Small variations to simulate camera movement
+            "heading": base_metadata["heading"] + i * 0.1,
+            "pitch": base_metadata["pitch"] + i * 0.01,
+            "roll": base_metadata["roll"] - i * 0.02,
+            "latitude": base_metadata["latitude"] + i * 0.00001,
+            "longitude": base_metadata["longitude"] + i * 0.00001,
+            "altitude": base_metadata["altitude"] + i * 0.5,
+            # Timestamp incremented by 40ms per frame for 25 fps
+            "timestamp": base_timestamp + (i * 40_000),
+        }
 
         metadata_list.append(frame_meta)
 
@@ -76,12 +79,13 @@ def stationary_camera(num_frames: int = 30) -> List[Dict[str, Any]]:
         List of metadata dictionaries
     """
     base_time = datetime.now(timezone.utc)
+    base_us = int(base_time.timestamp() * 1_000_000)
 
     metadata_list = []
     for i in range(num_frames):
         metadata_list.append(
             {
-                "timestamp": base_time.timestamp() * 1_000_000 + (i * 33_333),  # 30 fps
+                "timestamp": base_us + i * 33_333,  # 30 fps
                 "mission_id": "STATIONARY_TEST",
                 "latitude": 37.7749,
                 "longitude": -122.4194,
@@ -109,6 +113,7 @@ def moving_camera_path(num_frames: int = 60) -> List[Dict[str, Any]]:
         List of metadata dictionaries
     """
     base_time = datetime.now(timezone.utc)
+    base_us = int(base_time.timestamp() * 1_000_000)
 
     # Start and end positions
     start_lat, end_lat = 37.7749, 37.8049
@@ -116,27 +121,56 @@ def moving_camera_path(num_frames: int = 60) -> List[Dict[str, Any]]:
     start_alt, end_alt = 300.0, 800.0
     start_heading, end_heading = 45.0, 225.0
 
-    metadata_list = []
-    for i in range(num_frames):
-        t = i / (num_frames - 1) if num_frames > 1 else 0
-
-        metadata_list.append(
-            {
-                "timestamp": base_time.timestamp() * 1_000_000 + (i * 33_333),
-                "mission_id": "MOVING_TEST",
-                "latitude": start_lat + (end_lat - start_lat) * t,
-                "longitude": start_lon + (end_lon - start_lon) * t,
-                "altitude": start_alt + (end_alt - start_alt) * t,
-                "heading": start_heading + (end_heading - start_heading) * t,
-                "pitch": -20.0 + 15.0 * t,
-                "roll": 10.0 * t,
-                "horizontal_fov": 70.0,
-                "vertical_fov": 50.0,
-                "slant_range": 6000.0 - 3000.0 * t,
-            }
+    # Interpolate every field for all frames at once. numpy is imported here
+    # rather than at module level so the CLI's --list stays lightweight.
+    import numpy as np
+
+    frame_idx = np.arange(num_frames)
+    t = frame_idx / (num_frames - 1) if num_frames > 1 else np.zeros(num_frames)
+
+    timestamps = base_us + frame_idx * 33_333
+    latitudes = start_lat + (end_lat - start_lat) * t
+    longitudes = start_lon + (end_lon - start_lon) * t
+    altitudes = start_alt + (end_alt - start_alt) * t
+    headings = start_heading + (end_heading - start_heading) * t
+    pitches = -20.0 + 15.0 * t
+    rolls = 10.0 * t
+    slant_ranges = 6000.0 - 3000.0 * t
+
+    return [
+        {
+            "timestamp": timestamp,
+            "mission_id": "MOVING_TEST",
+            "latitude": latitude,
+            "longitude": longitude,
+            "altitude": altitude,
+            "heading": heading,
+            "pitch": pitch,
+            "roll": roll,
+            "horizontal_fov": 70.0,
+            "vertical_fov": 50.0,
+            "slant_range": slant_range,
+        }
+        for (
+            timestamp,
+            latitude,
+            longitude,
+            altitude,
+            heading,
+            pitch,
+            roll,
+            slant_range,
+        ) in zip(
+            timestamps.tolist(),
+            latitudes.tolist(),
+            longitudes.tolist(),
+            altitudes.tolist(),
+            headings.tolist(),
+            pitches.tolist(),
+            rolls.tolist(),
+            slant_ranges.tolist(),
         )
-
-    return metadata_list
+    ]
 
 
 def high_altitude_survey(num_frames: int = 30) -> List[Dict[str, Any]]:
@@ -150,12 +184,13 @@ def high_altitude_survey(num_frames: int = 30) -> List[Dict[str, Any]]:
         List of metadata dictionaries
     """
     base_time = datetime.now(timezone.utc)
+    base_us = int(base_time.timestamp() * 1_000_000)
 
     metadata_list = []
     for i in range(num_frames):
         metadata_list.append(
             {
-                "timestamp": base_time.timestamp() * 1_000_000 + (i * 33_333),
+                "timestamp": base_us + i * 33_333,
                 "mission_id": "HIGH_ALT_SURVEY",
                 "latitude": 37.7749 + i * 0.0001,
                 "longitude": -122.4194 + i * 0.0001,
@@ -183,12 +218,13 @@ def minimal_metadata(num_frames: int = 10) -> List[Dict[str, Any]]:
         List of metadata dictionaries
     """
     base_time = datetime.now(timezone.utc)
+    base_us = int(base_time.timestamp() * 1_000_000)
 
     metadata_list = []
     for i in range(num_frames):
         metadata_list.append(
             {
-                "timestamp": base_time.timestamp() * 1_000_000 + (i * 33_333),
+                "timestamp": base_us + i * 33_333,
                 "mission_id": "MINIMAL_TEST",
             }
         )
@@ -196,39 +232,41 @@ def minimal_metadata(num_frames: int = 10) -> List[Dict[str, Any]]:
     return metadata_list
 
 
-# Scenario registry
-SCENARIOS = {
-    "sample_video": {
-        "name": "Sample Video Match",
-        "description": "10 frames matching sample_video.mpg middle frames (frame 812)",
-        "generator": sample_video_middle_metadata,
-        "default_output": "videos/test_sample_match.mpg",
-    },
-    "stationary": {
-        "name": "Stationary Camera",
-        "description": "Fixed camera position and orientation",
-        "generator": stationary_camera,
-        "default_output": "videos/test_stationary.mpg",
-    },
-    "moving": {
-        "name": "Moving Camera Path",
-        "description": "Camera moving along a defined path",
-        "generator": moving_camera_path,
-        "default_output": "videos/test_moving.mpg",
-    },
-    "high_altitude": {
-        "name": "High Altitude Survey",
-        "description": "High-altitude camera with downward view",
-        "generator": high_altitude_survey,
-        "default_output": "videos/test_high_alt.mpg",
-    },
-    "minimal": {
-        "name": "Minimal Metadata",
-        "description": "Only mandatory KLV fields",
-        "generator": minimal_metadata,
-        "default_output": "videos/test_minimal.mpg",
-    },
-}
+# Scenario registry (read-only)
+SCENARIOS: Mapping[str, Dict[str, Any]] = MappingProxyType(
+    {
+        "sample_video": {
+            "name": "Sample Video Match",
+            "description": "10 frames matching sample_video.mpg middle frames (frame 812)",
+            "generator": sample_video_middle_metadata,
+            "default_output": "videos/test_sample_match.mpg",
+        },
+        "stationary": {
+            "name": "Stationary Camera",
+            "description": "Fixed camera position and orientation",
+            "generator": stationary_camera,
+            "default_output": "videos/test_stationary.mpg",
+        },
+        "moving": {
+            "name": "Moving Camera Path",
+            "description": "Camera moving along a defined path",
+            "generator": moving_camera_path,
+            "default_output": "videos/test_moving.mpg",
+        },
+        "high_altitude": {
+            "name": "High Altitude Survey",
+            "description": "High-altitude camera with downward view",
+            "generator": high_altitude_survey,
+            "default_output": "videos/test_high_alt.mpg",
+        },
+        "minimal": {
+            "name": "Minimal Metadata",
+            "description": "Only mandatory KLV fields",
+            "generator": minimal_metadata,
+            "default_output": "videos/test_minimal.mpg",
+        },
+    }
+)
 
 
 def get_scenario(name: str) -> Dict[str, Any]:
@@ -1,15 +1,26 @@
 """Modify KLV metadata in existing videos."""
 
+import mmap
+import os
+import re
 import subprocess
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 
-from .video_builder import build_klv_video, VideoFrameGenerator
-from .klv_converter import parse_klv_packet_to_pydantic, pydantic_to_flat_dict
+from .video_builder import build_klv_video, KLVMetadataGenerator, VideoFrameGenerator
+from .klv_converter import parse_klv_packet_full, pydantic_to_flat_dict
+
+
+# Parsing is pure, and the same packets come back when a video and its
+# round-tripped copy are read in one process. The cached model never leaves
+# this module; parse_klv_packet hands out fresh dicts built from it.
+_parse_klv_packet_cached = lru_cache(maxsize=4096)(parse_klv_packet_full)
 
 
 def parse_klv_packet(packet: bytes) -> Tuple[Dict[str, Any], bytes, Dict[str, bytes]]:
@@ -28,13 +39,13 @@ def parse_klv_packet(packet: bytes) -> Tuple[Dict[str, Any], bytes, Dict[str, by
         - raw_packet is the original bytes
         - unknown_tags is a dict of {tag_hex: tag_bytes} for preserving unknown fields
     """
-    # Use new Pydantic-based parsing
-    parsed = parse_klv_packet_to_pydantic(packet)
+    # Use new Pydantic-based parsing; unknown tags come from the same klvdata pass
+    parsed, unknown_tags = _parse_klv_packet_cached(packet)
 
-    # Convert to flat dict for backward compatibility, extracting unknown tags
-    flat_dict, raw_packet, unknown_tags = pydantic_to_flat_dict(parsed)
+    # Convert to flat dict for backward compatibility
+    flat_dict, raw_packet, _ = pydantic_to_flat_dict(parsed, include_unknown_tags=False)
 
-    return flat_dict, raw_packet, unknown_tags
+    return flat_dict, raw_packet, dict(unknown_tags)
 
 
 def extract_klv_stream_ffmpeg(video_path: str, output_path: str) -> None:
@@ -60,70 +71,168 @@ def extract_klv_stream_ffmpeg(video_path: str, output_path: str) -> None:
         output_path,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # FFmpeg's log is only needed to report a failure, so keep it as bytes and
+    # decode it then
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
     if result.returncode != 0:
-        raise RuntimeError(f"FFmpeg failed to extract KLV stream: {result.stderr}")
+        stderr = result.stderr.decode(errors="replace")
+        raise RuntimeError(f"FFmpeg failed to extract KLV stream: {stderr}")
 
 
-def parse_klv_file(
-    klv_path: str,
-) -> Dict[int, Tuple[Dict[str, Any], bytes, Dict[str, bytes]]]:
+def read_klv_stream_ffmpeg(video_path: str) -> bytes:
     """
-    Parse KLV packets from a file into frame-indexed metadata.
+    Extract the KLV/data stream from a video into memory using FFmpeg.
 
     Args:
-        klv_path: Path to file containing raw KLV packets
+        video_path: Path to input video
 
     Returns:
-        Dictionary mapping frame numbers to (metadata_dict, raw_packet, unknown_tags) tuples
+        Raw KLV stream bytes, as extract_klv_stream_ffmpeg() would write them
     """
-    metadata_per_frame = {}
+    cmd = [
+        "ffmpeg",
+        "-i",
+        video_path,
+        "-map",
+        "0:d",  # Map data stream
+        "-c",
+        "copy",  # Copy without re-encoding
+        "-f",
+        "data",  # Output as raw data
+        "pipe:1",
+    ]
 
-    with open(klv_path, "rb") as f:
-        klv_data = f.read()
-
-    # UAS LS key is 16 bytes
-    uas_ls_key = bytes(
-        [
-            0x06,
-            0x0E,
-            0x2B,
-            0x34,
-            0x02,
-            0x0B,
-            0x01,
-            0x01,
-            0x0E,
-            0x01,
-            0x03,
-            0x01,
-            0x01,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        raise RuntimeError(f"FFmpeg failed to extract KLV stream: {stderr}")
+
+    return result.stdout
+
+
+def remux_video_lossless_ffmpeg(
+    input_path: str,
+    output_path: str,
+    metadata_per_frame: List[Dict[str, Any]],
+    parallel: bool = False,
+) -> Dict[str, Any]:
+    """
+    Remux video with new KLV metadata using FFmpeg stream copy.
+
+    The video stream, and any audio streams, are copied without decoding or
+    re-encoding. The input's data streams are replaced by the new KLV, and
+    other streams (e.g. subtitles) are not carried over. As with the ffmpeg
+    backend of build_klv_video(), the KLV is muxed as a generic data stream
+    rather than a KLVA-tagged one.
 
+    Args:
+        input_path: Input video file path (.mpg, .ts)
+        output_path: Output video file path (.mpg, .ts)
+        metadata_per_frame: List of metadata dictionaries, one per frame
+        parallel: If True, encode long KLV streams across worker processes.
+                 Only set it from a process that is safe to fork (no running
+                 threads or GStreamer pipeline). Default is False.
+
+    Returns:
+        Dictionary with remux results
+    """
+    klv_gen = KLVMetadataGenerator()
+    klv_stream = b"".join(klv_gen.create_packets(metadata_per_frame, parallel=parallel))
+
+    # The sidecar doubles as FFmpeg's KLV input
+    klv_output = Path(output_path).with_suffix(".klv")
+    klv_output.write_bytes(klv_stream)
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        input_path,
+        "-f",
+        "data",
+        "-i",
+        str(klv_output),
+        "-map",
+        "0:v",
+        "-map",
+        "0:a?",  # Keep audio, if the input has any
+        "-map",
+        "1:0",
+        "-c:v",
+        "copy",  # Pass video through untouched
+        "-c:a",
+        "copy",  # Pass audio through untouched
+        "-c:d",
+        "copy",  # Copy data stream
+        "-metadata:s:d:0",
+        "language=klv",  # Try to hint KLV
+        "-f",
+        "mpegts",
+        output_path,
+    ]
+
+    # Only the exit status is used
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    success = result.returncode == 0
+    if not success:
+        print("Warning: FFmpeg remux may have issues.")
+        print(f"KLV saved separately to: {klv_output}")
+
+    return {
+        "success": success,
+        "video_path": output_path,
+        "klv_path": str(klv_output),
+        "num_frames": len(metadata_per_frame),
+        "total_klv_bytes": len(klv_stream),
+        "lossless": True,
+    }
+
+
+# UAS LS key is 16 bytes; shared with the packet encoder
+_UAS_LS_KEY = KLVMetadataGenerator.UAS_LS_KEY
+
+# Compiled once: the regex engine's literal prefix search beats bytes.find per
+# packet, and works on mmap buffers too
+_search_uas_ls_key = re.compile(re.escape(_UAS_LS_KEY)).search
+
+
+def iter_klv_packets(
+    klv_data: Union[bytes, mmap.mmap],
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over the packets in a buffer of raw KLV, without parsing.
+
+    Args:
+        klv_data: Raw KLV stream bytes, or a read-only mmap of them
+
+    Yields:
+        (frame_num, packet_value) pairs in stream order, where packet_value is
+        the packet bytes without the UAS LS key and BER length prefix
+    """
     frame_num = 0
     offset = 0
+    data_len = len(klv_data)
 
-    while offset < len(klv_data):
+    while offset < data_len:
         # Find next UAS LS key
-        key_start = klv_data.find(uas_ls_key, offset)
-        if key_start == -1:
+        match = _search_uas_ls_key(klv_data, offset)
+        if match is None:
             break
+        key_start = match.start()
 
         # Read BER-encoded length
         offset = key_start + 16
-        if offset >= len(klv_data):
+        if offset >= data_len:
             break
 
         length_byte = klv_data[offset]
         if length_byte & 0x80:
             # Multi-byte length
             num_length_bytes = length_byte & 0x7F
-            if offset + num_length_bytes >= len(klv_data):
+            if offset + num_length_bytes >= data_len:
                 break
             length = int.from_bytes(
                 klv_data[offset + 1 : offset + 1 + num_length_bytes], "big"
@@ -134,43 +243,315 @@ def parse_klv_file(
             offset += 1
 
         # Extract packet value (without key and length prefix)
-        if offset + length > len(klv_data):
+        if offset + length > data_len:
             break
 
-        # Pass only the value portion to the parser (not the key/length prefix)
-        packet_value = klv_data[offset : offset + length]
-
-        # Parse packet
-        metadata_dict, raw_packet, unknown_tags = parse_klv_packet(packet_value)
-        metadata_per_frame[frame_num] = (metadata_dict, raw_packet, unknown_tags)
+        # Keep only the value portion (not the key/length prefix)
+        yield frame_num, klv_data[offset : offset + length]
         frame_num += 1
 
         offset += length
 
-    return metadata_per_frame
 
+def split_klv_packets(klv_data: Union[bytes, mmap.mmap]) -> Dict[int, bytes]:
+    """
+    Split a buffer of raw KLV packets into frame-indexed packet values, without parsing.
+
+    Args:
+        klv_data: Raw KLV stream bytes, or a read-only mmap of them
+
+    Returns:
+        Dictionary mapping frame numbers to packet value bytes, as yielded by
+        iter_klv_packets()
+    """
+    return dict(iter_klv_packets(klv_data))
+
+
+def read_klv_packets(klv_path: str) -> Dict[int, bytes]:
+    """
+    Split a file of raw KLV packets into frame-indexed packet values, without parsing.
+
+    Args:
+        klv_path: Path to file containing raw KLV packets
+
+    Returns:
+        Dictionary mapping frame numbers to packet value bytes, as for
+        split_klv_packets()
+    """
+    with open(klv_path, "rb") as f:
+        # mmap can't map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        # Search the mapped file in place; only the packet values get copied
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return split_klv_packets(mm)
+
+
+# Below this many packets, starting worker processes costs more than parsing
+# the packets serially saves
+_PARALLEL_PARSE_MIN_PACKETS = 1_000
+
+
+def parse_klv_file(
+    klv_path: str, parallel: bool = False
+) -> Dict[int, Tuple[Dict[str, Any], bytes, Dict[str, bytes]]]:
+    """
+    Parse KLV packets from a file into frame-indexed metadata.
+
+    Args:
+        klv_path: Path to file containing raw KLV packets
+        parallel: If True, spread the parsing of long files across CPU cores
+            with worker processes. Packets are independent, so the result is
+            the same either way.
+
+    Returns:
+        Dictionary mapping frame numbers to (metadata_dict, raw_packet, unknown_tags) tuples
+    """
+    packets = read_klv_packets(klv_path)
+    if (
+        parallel
+        and len(packets) >= _PARALLEL_PARSE_MIN_PACKETS
+        and (os.cpu_count() or 1) > 1
+    ):
+        with ProcessPoolExecutor() as executor:
+            return dict(
+                zip(
+                    packets.keys(),
+                    executor.map(parse_klv_packet, packets.values(), chunksize=64),
+                )
+            )
+    return {
+        frame_num: parse_klv_packet(packet) for frame_num, packet in packets.items()
+    }
+
+
+def _read_video_properties(cap: "cv2.VideoCapture") -> Dict[str, int]:
+    """Read fps, frame size and frame count from an open capture."""
+    return {
+        "fps": int(cap.get(cv2.CAP_PROP_FPS)),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "num_frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+    }
+
+
+def _iter_capture(cap: "cv2.VideoCapture") -> Iterator[np.ndarray]:
+    """Yield frames from an open capture, releasing it once exhausted."""
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+
+def _count_video_packets(av, video_path: str) -> int:
+    """Count the packets in a video's first video stream with PyAV, without decoding."""
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        # The demuxer ends with an empty flush packet, which holds no frame
+        return sum(1 for packet in container.demux(stream) if packet.size)
+
+
+def _open_pyav(
+    video_path: str, hwaccel: Optional[str] = None
+) -> Tuple[Iterator[np.ndarray], Dict[str, int]]:
+    """Open a video with PyAV, returning a frame iterator and its properties."""
+    try:
+        import av
+    except ImportError as e:
+        raise ImportError(
+            f"PyAV decoder not available: {e}\n\n"
+            "Install with: pip install av\n\n"
+            "Or use decoder='opencv'"
+        ) from e
+
+    if hwaccel is not None:
+        from av.codec.hwaccel import HWAccel
+
+        # Decode on the GPU where the device exists, otherwise in software
+        container = av.open(
+            video_path,
+            hwaccel=HWAccel(device_type=hwaccel, allow_software_fallback=True),
+        )
+    else:
+        container = av.open(video_path)
+    stream = container.streams.video[0]
+    # Let FFmpeg decode with its own frame/slice threads (0 = one per core)
+    stream.thread_type = "AUTO"
+    stream.thread_count = 0
+
+    num_frames = stream.frames
+    if not num_frames:
+        # MPEG-TS and Matroska rarely record a frame count, and estimating one
+        # from the duration can round to 0 or miss frames, so count the
+        # stream's packets instead (demuxing only, no decoding)
+        num_frames = _count_video_packets(av, video_path)
+
+    properties = {
+        "fps": int(stream.average_rate or 0),
+        "width": stream.codec_context.width,
+        "height": stream.codec_context.height,
+        "num_frames": num_frames,
+    }
+
+    def iter_frames() -> Iterator[np.ndarray]:
+        try:
+            for frame in container.decode(stream):
+                yield frame.to_ndarray(format="bgr24")
+        finally:
+            container.close()
+
+    return iter_frames(), properties
+
+
+def stream_video(
+    video_path: str, decoder: str = "opencv", hwaccel: Optional[str] = None
+) -> Tuple[Iterator[np.ndarray], Dict[str, int]]:
+    """
+    Open a video once for lazy, one-frame-at-a-time decoding.
+
+    Args:
+        video_path: Path to video file
+        decoder: "opencv" (default) or "pyav". PyAV decodes straight from
+                FFmpeg with multi-threaded decoding and needs the optional
+                'av' package.
+        hwaccel: Optional hardware decode device, e.g. "cuda", "vaapi" or
+                "videotoolbox". PyAV uses the named device; OpenCV picks any
+                acceleration its FFmpeg build supports. Both fall back to
+                software decoding when no device is available.
+
+    Returns:
+        Tuple of (frames, properties) where frames is an iterator of BGR numpy
+        arrays and properties has 'fps', 'width', 'height' and 'num_frames' keys
+        (num_frames is the container's frame count estimate)
+    """
+    if decoder == "pyav":
+        return _open_pyav(video_path, hwaccel)
+    if decoder != "opencv":
+        raise ValueError(f"Unknown decoder: {decoder}. Use 'opencv' or 'pyav'")
+
+    if hwaccel is not None:
+        cap = cv2.VideoCapture(
+            video_path,
+            cv2.CAP_ANY,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+    else:
+        cap = cv2.VideoCapture(video_path)
+    properties = _read_video_properties(cap)
+    return _iter_capture(cap), properties
+
+
+def extract_video_frames_iter(
+    video_path: str, decoder: str = "opencv", hwaccel: Optional[str] = None
+) -> Iterator[np.ndarray]:
+    """
+    Iterate over the frames of a video without holding them all in memory.
+
+    Args:
+        video_path: Path to video file
+        decoder: "opencv" (default) or "pyav", as for stream_video()
+        hwaccel: Optional hardware decode device, as for stream_video()
 
-def extract_video_frames(video_path: str) -> List[np.ndarray]:
+    Yields:
+        Frames as numpy arrays (BGR format)
+    """
+    return stream_video(video_path, decoder, hwaccel)[0]
+
+
+def load_video(
+    video_path: str, decoder: str = "opencv", hwaccel: Optional[str] = None
+) -> Tuple[List[np.ndarray], Dict[str, int]]:
+    """
+    Extract all frames and the video properties with a single capture.
+
+    Args:
+        video_path: Path to video file
+        decoder: "opencv" (default) or "pyav", as for stream_video()
+        hwaccel: Optional hardware decode device, as for stream_video()
+
+    Returns:
+        Tuple of (frames, properties) where frames is a list of BGR numpy arrays
+        and properties is as returned by stream_video()
+    """
+    frames, properties = stream_video(video_path, decoder, hwaccel)
+    return list(frames), properties
+
+
+def extract_video_frames(
+    video_path: str, decoder: str = "opencv", hwaccel: Optional[str] = None
+) -> List[np.ndarray]:
     """
     Extract all frames from video.
 
     Args:
         video_path: Path to video file
+        decoder: "opencv" (default) or "pyav", as for stream_video()
+        hwaccel: Optional hardware decode device, as for stream_video()
 
     Returns:
         List of frames as numpy arrays (BGR format)
     """
-    cap = cv2.VideoCapture(video_path)
-    frames = []
+    return load_video(video_path, decoder, hwaccel)[0]
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frames.append(frame)
 
-    cap.release()
-    return frames
+class StreamingFrameGenerator(VideoFrameGenerator):
+    """
+    Serves frames from an iterator of decoded frames.
+
+    Frames are pulled from the iterator on demand and only the last
+    ``buffer_size`` are kept, so memory stays constant for sequential
+    consumers such as build_klv_video().
+    """
+
+    def __init__(self, frames: Iterable[np.ndarray], buffer_size: int = 4):
+        """
+        Initialize streaming frame generator.
+
+        Args:
+            frames: Iterable of BGR frames in presentation order
+            buffer_size: Number of recently decoded frames kept for re-reads
+        """
+        self._frames = iter(frames)
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._next_index = 0
+
+        # Peek at the first frame for the output dimensions
+        if self._advance():
+            first_frame = self._buffer[0][1]
+            self.width = first_frame.shape[1]
+            self.height = first_frame.shape[0]
+        else:
+            self.width = 0
+            self.height = 0
+
+    def _advance(self) -> bool:
+        """Decode the next frame into the buffer; False once exhausted."""
+        frame = next(self._frames, None)
+        if frame is None:
+            return False
+        self._buffer.append((self._next_index, frame))
+        self._next_index += 1
+        return True
+
+    def generate_frame(self, frame_num, total_frames, custom_text=None):
+        while self._next_index <= frame_num:
+            if not self._advance():
+                raise IndexError(
+                    f"Frame {frame_num} requested but video has {self._next_index} frames"
+                )
+
+        for index, frame in self._buffer:
+            if index == frame_num:
+                return frame
+
+        raise IndexError(
+            f"Frame {frame_num} is no longer buffered "
+            f"(buffer holds frames {self._buffer[0][0]}-{self._buffer[-1][0]})"
+        )
 
 
 def modify_video_metadata(
@@ -179,6 +560,9 @@ def modify_video_metadata(
     metadata_overrides: Dict[int, Dict[str, Any]],
     backend: str = "gstreamer",
     lossless: bool = True,
+    decoder: str = "opencv",
+    hwaccel: Optional[str] = None,
+    verbose: bool = False,
 ) -> Dict[str, Any]:
     """
     Modify KLV metadata in an existing video.
@@ -192,10 +576,18 @@ def modify_video_metadata(
         output_video_path: Path for output video (.mpg or .ts)
         metadata_overrides: Dict mapping frame numbers to metadata field updates
                            Example: {5: {"latitude": 37.5}, 10: {"altitude": 1000}}
-        backend: "gstreamer" (default) or "ffmpeg" (only used if lossless=False)
+        backend: "gstreamer" (default) or "ffmpeg". With lossless=True, "ffmpeg"
+                remuxes with FFmpeg stream copy (KLV as a generic data stream)
+                instead of GStreamer.
         lossless: If True (default), preserve original video frames exactly without
-                 re-encoding. Only the KLV metadata is replaced. Requires GStreamer.
+                 re-encoding. Only the KLV metadata is replaced.
                  If False, video is decoded and re-encoded (lossy but more flexible).
+        decoder: Frame decoder used when lossless=False: "opencv" (default) or
+                "pyav" (requires the optional 'av' package)
+        hwaccel: Optional hardware decode device for lossless=False, as for
+                stream_video(). Lossless mode never decodes frames.
+        verbose: If True, print the updated fields of every modified frame
+                instead of only a summary
 
     Returns:
         Dictionary with generation results
@@ -217,27 +609,29 @@ def modify_video_metadata(
     """
     print(f"Processing {input_video_path}...")
 
-    # Get video properties first
-    cap = cv2.VideoCapture(input_video_path)
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    num_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    cap.release()
+    # Get video properties first. A re-encode reads them from the same
+    # capture that later decodes its frames, so the input is opened only once.
+    if lossless:
+        cap = cv2.VideoCapture(input_video_path)
+        properties = _read_video_properties(cap)
+        cap.release()
+    else:
+        frames, properties = stream_video(input_video_path, decoder, hwaccel)
+    fps = properties["fps"]
+    width = properties["width"]
+    height = properties["height"]
+    num_frames = properties["num_frames"]
 
     print(f"Video: {width}x{height} @ {fps} fps, {num_frames} frames")
 
     # Extract KLV stream using FFmpeg
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_klv = Path(temp_dir) / "extracted.klv"
+    print("Extracting KLV stream with FFmpeg...")
+    klv_data = read_klv_stream_ffmpeg(input_video_path)
 
-        print("Extracting KLV stream with FFmpeg...")
-        extract_klv_stream_ffmpeg(input_video_path, str(temp_klv))
+    print("Reading KLV packets...")
+    original_packets = split_klv_packets(klv_data)
 
-        print("Parsing KLV metadata...")
-        original_metadata = parse_klv_file(str(temp_klv))
-
-    print(f"Found metadata for {len(original_metadata)} frames")
+    print(f"Found metadata for {len(original_packets)} frames")
 
     # Validate frame numbers
     invalid_frames = [f for f in metadata_overrides.keys() if f >= num_frames]
@@ -249,43 +643,52 @@ def modify_video_metadata(
 
     # Merge metadata
     print("Merging metadata...")
-    merged_metadata = []
-
-    for frame_num in range(num_frames):
-        original_tuple = original_metadata.get(frame_num, ({}, None, {}))
-
-        if isinstance(original_tuple, tuple):
-            if len(original_tuple) == 3:
-                frame_meta, raw_packet, unknown_tags = original_tuple
-            elif len(original_tuple) == 2:
-                frame_meta, raw_packet = original_tuple
-                unknown_tags = {}
-            else:
-                frame_meta = original_tuple
-                raw_packet = None
-                unknown_tags = {}
-        else:
-            frame_meta = original_tuple
-            raw_packet = None
-            unknown_tags = {}
 
-        frame_meta = frame_meta.copy()
+    # Start with every frame's packet passed through as-is, unparsed
+    get_packet = original_packets.get
+    merged_metadata = [
+        {"_raw_klv_packet": raw_packet} if raw_packet is not None else {}
+        for raw_packet in map(get_packet, range(num_frames))
+    ]
 
-        if frame_num in metadata_overrides:
-            if "_raw_klv_packet" in frame_meta:
-                del frame_meta["_raw_klv_packet"]
-            if unknown_tags:
-                frame_meta["_unknown_klv_tags"] = unknown_tags
-            frame_meta.update(metadata_overrides[frame_num])
-            print(f"  Frame {frame_num}: Updated {list(metadata_overrides[frame_num].keys())}")
+    # Then parse and merge only the frames with overrides, in frame order
+    updated_frames = 0
+    frames_with_unknown_tags = 0
+    for frame_num, overrides in sorted(metadata_overrides.items()):
+        if frame_num < 0:
+            continue
+        raw_packet = get_packet(frame_num)
+        if raw_packet is not None:
+            frame_meta, _, unknown_tags = parse_klv_packet(raw_packet)
+        else:
+            frame_meta, unknown_tags = {}, {}
+        if unknown_tags:
+            frame_meta["_unknown_klv_tags"] = unknown_tags
+        frame_meta.update(overrides)
+        merged_metadata[frame_num] = frame_meta
+
+        updated_frames += 1
+        if unknown_tags:
+            frames_with_unknown_tags += 1
+        if verbose:
+            print(f"  Frame {frame_num}: Updated {list(overrides.keys())}")
             if unknown_tags:
                 print(f"  Frame {frame_num}: Preserving {len(unknown_tags)} unknown KLV tags")
-        elif raw_packet is not None:
-            frame_meta["_raw_klv_packet"] = raw_packet
 
-        merged_metadata.append(frame_meta)
+    print(f"  Updated {updated_frames} frames")
+    if frames_with_unknown_tags:
+        print(f"  Preserved unknown KLV tags in {frames_with_unknown_tags} frames")
 
-    if lossless:
+    if lossless and backend == "ffmpeg":
+        print("\nLossless remux (FFmpeg): preserving original video frames")
+        print(f"Output: {output_video_path}")
+
+        result = remux_video_lossless_ffmpeg(
+            input_path=input_video_path,
+            output_path=output_video_path,
+            metadata_per_frame=merged_metadata,
+        )
+    elif lossless:
         from .gstreamer_muxer import remux_video_lossless
 
         print(f"\nLossless remux: preserving original video frames")
@@ -298,23 +701,11 @@ def modify_video_metadata(
             fps=fps,
         )
     else:
-        print("Extracting video frames for re-encoding...")
-        frames = extract_video_frames(input_video_path)
-        print(f"Extracted {len(frames)} frames")
-
         print(f"\nGenerating output video: {width}x{height} @ {fps} fps")
         print(f"Using backend: {backend}")
 
-        class PreExtractedFrameGenerator(VideoFrameGenerator):
-            def __init__(self, frames_list):
-                self.frames_list = frames_list
-                self.width = frames_list[0].shape[1] if frames_list else 0
-                self.height = frames_list[0].shape[0] if frames_list else 0
-
-            def generate_frame(self, frame_num, total_frames, custom_text=None):
-                return self.frames_list[frame_num]
-
-        frame_gen = PreExtractedFrameGenerator(frames)
+        # Decode frames on demand instead of holding the whole video in memory
+        frame_gen = StreamingFrameGenerator(frames)
 
         result = build_klv_video(
             output_path=output_video_path,